@@ -0,0 +1,13 @@
+"""
+Запуск пакетного режима: python desktop ... или python -m desktop ...
+"""
+import os
+import sys
+
+# Модули приложения лежат рядом, добавляем каталог для запуска через -m
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
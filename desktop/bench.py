@@ -0,0 +1,211 @@
+"""
+Замеры производительности вычислительного ядра:
+
+    python desktop bench                          # сравнение с bench_baseline.json
+    python desktop bench --save bench_baseline.json
+    python desktop bench --quick --filter batch
+    python desktop bench --accuracy               # точность float32 против float64
+
+Каждый замер — вызов функции движка на фиксированных (сгенерированных с seed)
+данных. Отчет: пропускная способность (рядов/с по медиане), перцентили
+задержки p50/p90/p99 и пик выделенной памяти (tracemalloc). Базовая линия
+записывается на машине, где идут ночные прогоны; замедление или рост памяти
+сверх допуска завершает команду с ненулевым кодом.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from engine import (FORECAST_FIELDS, backtest, bootstrap_quantiles, calculate_forecast, calculate_forecast_batch,
+                    optimize_alpha)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Допустимое отклонение от базовой линии (доля)
+TOLERANCE = 0.3
+
+# Минимальное время и число повторов одного замера
+MIN_TIME = 0.5
+MIN_CALLS = 5
+
+
+def make_panel(n_series, n_obs, seed=0):
+    """Панель с квадратичным трендом и шумом, одинаковая при каждом запуске"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_obs)
+    trend = 100 + rng.normal(0, 1, (n_series, 1)) * t + rng.normal(0, 0.05, (n_series, 1)) * t ** 2
+    return trend + rng.normal(0, 2, (n_series, n_obs))
+
+
+def cases(quick=False):
+    """
+    Замеры: (имя, число рядов за вызов, функция без аргументов).
+    quick — сокращенный набор меньших размеров для быстрой проверки.
+    """
+    lengths = (10, 100) if quick else (10, 100, 1000)
+    horizons = (13, 100) if quick else (13, 100, 1000)
+    panels = (1000, 10000) if quick else (1000, 10000, 100000)
+    grids = (20, 50) if quick else (20, 50, 200)
+
+    # Один ряд: длина ряда и горизонт
+    for n_obs in lengths:
+        values = make_panel(1, n_obs)[0]
+        yield f"scalar[n_obs={n_obs},horizon=13]", 1, lambda v=values: calculate_forecast(v, 0.0625)
+    for horizon in horizons[1:]:
+        values = make_panel(1, 10)[0]
+        yield (f"scalar[n_obs=10,horizon={horizon}]", 1,
+               lambda v=values, h=horizon: calculate_forecast(v, 0.0625, h))
+
+    # Панель: число рядов, длина ряда, горизонт
+    for n_series in panels:
+        for n_obs in lengths[:2]:
+            panel = make_panel(n_series, n_obs)
+            yield (f"batch[n_series={n_series},n_obs={n_obs},horizon=13]", n_series,
+                   lambda p=panel: calculate_forecast_batch(p, 0.0625))
+    panel = make_panel(panels[1], 10)
+    yield (f"batch[n_series={panels[1]},n_obs=10,horizon=100]", panels[1],
+           lambda p=panel: calculate_forecast_batch(p, 0.0625, 100))
+
+    # Те же панели в float32: память и скорость против float64
+    for n_series in panels[1:]:
+        for n_obs in lengths[:2]:
+            panel = make_panel(n_series, n_obs).astype(np.float32)
+            yield (f"batch[n_series={n_series},n_obs={n_obs},horizon=13,dtype=float32]", n_series,
+                   lambda p=panel: calculate_forecast_batch(p, 0.0625, dtype=np.float32))
+
+    # Подбор α: размер сетки
+    values = make_panel(1, 10)[0]
+    yield "alpha[n_series=1,grid=50]", 1, lambda v=values: optimize_alpha(v)
+    panel = make_panel(panels[0], 10)
+    for grid in grids:
+        yield (f"alpha[n_series={panels[0]},grid={grid}]", panels[0],
+               lambda p=panel, g=grid: optimize_alpha(p, grid_size=g))
+
+    # Бутстреп-интервалы: 2000 повторов на ряд
+    for n_series in (1, panels[0]):
+        panel = make_panel(n_series, 10)
+        yield (f"bootstrap[n_series={n_series},n_boot=2000,horizon=13]", n_series,
+               lambda p=panel: bootstrap_quantiles(p, 0.0625))
+
+    # Скользящая точка отсчета: 50 точек на ряд
+    panel = make_panel(panels[1], 60)
+    yield (f"backtest[n_series={panels[1]},origins=50,steps=5]", panels[1],
+           lambda p=panel: backtest(p, 0.0625, steps=5, origins=np.arange(10, 60)))
+
+
+def measure(func, n_series, min_time=MIN_TIME, min_calls=MIN_CALLS):
+    """Задержки вызовов (после прогревочного) и пик памяти отдельного вызова"""
+    func()
+
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_calls or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+
+    # Память меряется отдельно: трассировка замедляет вызов
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(times, [50, 90, 99]) * 1000
+    return {
+        "calls": len(times),
+        "p50_ms": round(p50, 4),
+        "p90_ms": round(p90, 4),
+        "p99_ms": round(p99, 4),
+        "series_per_sec": round(n_series / np.median(times), 1),
+        "peak_mb": round(peak / 2 ** 20, 3),
+    }
+
+
+def run(quick=False, pattern=None, min_time=MIN_TIME):
+    """Выполнение замеров; pattern — подстрока имени для выбора части набора"""
+    results = {}
+    for name, n_series, func in cases(quick):
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(func, n_series, min_time)
+        print(format_row(name, results[name]), flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Сравнение с базовой линией. Регрессия — пропускная способность ниже
+    (1 - tolerance) от базовой или пик памяти выше (1 + tolerance).
+    Возвращает список описаний регрессий.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        speed = current["series_per_sec"] / base["series_per_sec"]
+        if speed < 1 - tolerance:
+            regressions.append(f"{name}: скорость {speed:.0%} от базовой "
+                               f"({current['series_per_sec']:.0f} против {base['series_per_sec']:.0f} рядов/с)")
+
+        # Пики меньше 1 МБ не сравниваются: там преобладает шум аллокатора
+        if base["peak_mb"] >= 1 and current["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: память {current['peak_mb']:.1f} МБ "
+                               f"против {base['peak_mb']:.1f} МБ")
+    return regressions
+
+
+def accuracy(quick=False):
+    """
+    Точность расчета в float32 относительно float64 по полям прогноза: максимум
+    по рядам и шагам |Δ| / max|поле ряда|. Две строки на панель: «расчет» —
+    float64 по той же панели, округленной до float32 (только ошибки вычислений),
+    «всего» — float64 по исходной панели (вместе с округлением входных данных).
+    """
+    sizes = ((1000, 10, 13), (1000, 100, 13), (100, 10, 1000)) if quick else \
+        ((100000, 10, 13), (10000, 1000, 13), (10000, 10, 1000))
+    fields = [k for k, name in enumerate(FORECAST_FIELDS) if name != "year"]
+    print(f"{'':<40} " + " ".join(f"{FORECAST_FIELDS[k]:>8}" for k in fields))
+
+    for n_series, n_obs, horizon in sizes:
+        panel = make_panel(n_series, n_obs)
+        single = calculate_forecast_batch(panel, 0.0625, horizon, dtype=np.float32).data
+        references = (
+            ("расчет", calculate_forecast_batch(panel.astype(np.float32), 0.0625, horizon).data),
+            ("всего", calculate_forecast_batch(panel, 0.0625, horizon).data),
+        )
+        for label, exact in references:
+            scale = np.maximum(np.abs(exact).max(axis=2), np.finfo(np.float64).tiny)
+            error = (np.abs(single - exact).max(axis=2) / scale).max(axis=1)
+            name = f"[n_series={n_series},n_obs={n_obs},horizon={horizon}] {label}"
+            print(f"{name:<40} " + " ".join(f"{error[k]:8.1e}" for k in fields), flush=True)
+
+
+def format_row(name, result):
+    return (f"{name:<62} {result['series_per_sec']:>14,.0f} рядов/с  "
+            f"p50 {result['p50_ms']:>9.3f}  p90 {result['p90_ms']:>9.3f}  p99 {result['p99_ms']:>9.3f} мс  "
+            f"пик {result['peak_mb']:>8.2f} МБ")
+
+
+def load_baseline(path=None):
+    with open(path or BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(results, path=None):
+    """Запись базовой линии вместе с версиями окружения"""
+    import platform
+
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+    with open(path or BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
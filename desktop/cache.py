@@ -0,0 +1,89 @@
+"""
+LRU-кэш результатов расчёта прогноза
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine import calculate_forecast_batch
+
+
+class ForecastCache:
+    """
+    Кэш результатов calculate_forecast_batch с вытеснением давно не используемых.
+    Ограничивается числом записей и/или суммарным объёмом массивов в байтах.
+    Возвращаемые массивы доступны только для чтения. Безопасен для вызова
+    из нескольких потоков (сам расчет выполняется вне блокировки).
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(panel, alpha, horizon=13, first_year=2004, dtype=np.float64):
+        """Ключ кэша: хэш байтов входного массива, α, параметров горизонта и точности"""
+        y = np.ascontiguousarray(panel, dtype=float)
+        alpha = np.ascontiguousarray(alpha, dtype=float)
+
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (y, alpha):
+            digest.update(repr(part.shape).encode())
+            digest.update(part.tobytes())
+        digest.update(f"{horizon}|{first_year}|{np.dtype(dtype).name}".encode())
+        return digest.hexdigest()
+
+    def forecast_batch(self, panel, alpha, horizon=13, first_year=2004, dtype=np.float64):
+        """calculate_forecast_batch с сохранением результата в кэше"""
+        key = self.make_key(panel, alpha, horizon, first_year, dtype)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = calculate_forecast_batch(panel, alpha, horizon, first_year, dtype)
+        for array in result.arrays():
+            array.setflags(write=False)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = result
+                self.nbytes += result.nbytes
+                self._evict()
+        return result
+
+    def invalidate(self, key=None):
+        """Удаление одной записи по ключу или полная очистка кэша"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.nbytes = 0
+                return
+
+            result = self._entries.pop(key, None)
+            if result is not None:
+                self.nbytes -= result.nbytes
+
+    def _evict(self):
+        """Вытеснение самых старых записей сверх лимитов"""
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, result = self._entries.popitem(last=False)
+            self.nbytes -= result.nbytes
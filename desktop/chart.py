@@ -0,0 +1,309 @@
+"""
+График прогноза с постоянными объектами matplotlib.
+Линии и полоса интервала создаются один раз и помечены animated: при пересчете
+и смене вида меняются их данные, стиль и видимость, а на холст они выводятся
+через blitting поверх сохраненного фона. Фон (оси, сетка, деления, заголовок,
+легенда) кэшируется для каждого вида; полная перерисовка нужна только при смене
+масштаба осей, размера окна или при первом показе вида.
+Длинные ряды прореживаются до разрешения экрана для видимого диапазона
+(min/max по интервалам), маркеры скрываются при большом числе точек.
+Модуль импортируется после load_plotting (matplotlib уже загружен).
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import MaxNLocator
+
+# Маркеры линий; скрываются, если в видимом диапазоне больше MARKER_LIMIT точек
+MARKERS = {"observed": "o", "trend": "s", "forecast": "D"}
+MARKER_LIMIT = 300
+
+# Не больше стольких подписанных делений по годам; для длинных горизонтов — автоматический подбор
+MAX_YEAR_TICKS = 13
+
+# Вид графика: заголовок и стиль видимых объектов (остальные скрываются)
+VIEWS = {
+    "all": ("Сравнение наблюдаемых данных, тренда и прогноза", {
+        "observed": dict(linestyle="-", linewidth=2.5, markersize=8, alpha=0.9),
+        "trend": dict(linestyle="--", linewidth=2, markersize=5, alpha=0.8),
+        "forecast": dict(linestyle="-", linewidth=2.5, markersize=6, alpha=0.9),
+        "band": dict(alpha=0.15),
+    }),
+    "forecast": ("Прогнозные значения с доверительными интервалами", {
+        "forecast": dict(linestyle="-", linewidth=3, markersize=8, alpha=1.0),
+        "band": dict(alpha=0.2),
+    }),
+    "trend": ("Наблюдаемые данные и квадратичный тренд", {
+        "observed": dict(linestyle="-", linewidth=2, markersize=7, alpha=0.7),
+        "trend": dict(linestyle="-", linewidth=2.5, markersize=6, alpha=1.0),
+    }),
+}
+
+
+def _axis_limits(lo, hi, current):
+    """
+    Границы оси с полями 5%. Текущие границы сохраняются, если данные
+    в них помещаются и занимают не меньше 60% диапазона — тогда фон не меняется.
+    """
+    if current is not None:
+        c_lo, c_hi = current
+        if c_lo <= lo and hi <= c_hi and hi - lo >= 0.6 * (c_hi - c_lo):
+            return current
+
+    margin = 0.05 * ((hi - lo) or abs(hi) or 1.0)
+    return lo - margin, hi + margin
+
+
+def _bins(n, n_bins):
+    """Размер интервала и число дополняемых в конце точек для разбиения n точек на n_bins"""
+    size = -(-n // n_bins)
+    return size, size * (-(-n // size)) - n
+
+
+def minmax_decimate(x, y, n_bins):
+    """
+    Прореживание линии: в каждом из n_bins интервалов по индексу остаются
+    точки минимума и максимума (в исходном порядке), плюс первая и последняя.
+    Форма и выбросы сохраняются с точностью до пикселя при n_bins = ширине в пикселях.
+    """
+    n = len(y)
+    if n <= 2 * n_bins:
+        return x, y
+
+    size, pad = _bins(n, n_bins)
+    blocks = np.pad(y, (0, pad), mode="edge").reshape(-1, size)
+    offsets = np.arange(len(blocks)) * size
+    idx = np.concatenate([
+        [0, n - 1],
+        offsets + blocks.argmin(axis=1),
+        offsets + blocks.argmax(axis=1),
+    ])
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], y[idx]
+
+
+def envelope_decimate(x, lower, upper, n_bins):
+    """Прореживание полосы: нижняя граница — минимум, верхняя — максимум по интервалу"""
+    n = len(x)
+    if n <= 2 * n_bins:
+        return x, lower, upper
+
+    size, pad = _bins(n, n_bins)
+    lo = np.pad(lower, (0, pad), mode="edge").reshape(-1, size).min(axis=1)
+    hi = np.pad(upper, (0, pad), mode="edge").reshape(-1, size).max(axis=1)
+    starts = np.arange(len(lo)) * size
+    ends = np.minimum(starts + size - 1, n - 1)
+    return (np.column_stack([x[starts], x[ends]]).ravel(),
+            np.repeat(lo, 2), np.repeat(hi, 2))
+
+
+def _visible_slice(x, xmin, xmax):
+    """Индексы точек в видимом диапазоне плюс по одной соседней с каждой стороны"""
+    lo = max(np.searchsorted(x, xmin, side="left") - 1, 0)
+    hi = min(np.searchsorted(x, xmax, side="right") + 1, len(x))
+    return slice(lo, hi)
+
+
+class ForecastChart:
+    """Постоянные объекты графика на готовых Figure/Axes/холсте (colors — схема Colors)"""
+
+    def __init__(self, fig, ax, canvas, colors):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+
+        # Статический слой: оформление задается один раз, без tight_layout при обновлениях
+        ax.set_xlabel('Год', fontsize=11, fontweight='bold', color=colors.DARK)
+        ax.set_ylabel('Значение показателя', fontsize=11, fontweight='bold', color=colors.DARK)
+        ax.grid(True, alpha=0.2, linestyle='-')
+        ax.tick_params(axis='x', rotation=45)
+        ax.ticklabel_format(axis='x', style='plain', useOffset=False)
+        ax.spines['bottom'].set_color(colors.GRAY)
+        ax.spines['left'].set_color(colors.GRAY)
+        fig.subplots_adjust(left=0.09, right=0.97, top=0.9, bottom=0.14)
+
+        # Динамический слой
+        palette = colors.CHART_COLORS
+        self.lines = {
+            "observed": ax.plot([], [], 'o-', color=palette[0], label='Наблюдаемые данные')[0],
+            "trend": ax.plot([], [], 's--', color=palette[1], label='Квадратичный тренд')[0],
+            "forecast": ax.plot([], [], 'D-', color=palette[2], label='Прогноз (сглаживание)')[0],
+        }
+        self.band = PolyCollection([], facecolor=palette[2], edgecolor="none",
+                                   label='Доверительный интервал')
+        ax.add_collection(self.band, autolim=False)
+        self.title = ax.set_title("", fontsize=14, fontweight='bold', pad=20, color=colors.PRIMARY)
+        self.legend = None
+
+        self.artists = {**self.lines, "band": self.band}
+        for artist in self.artists.values():
+            artist.set_animated(True)
+
+        self.view = "all"
+        self.label = ""             # подпись ряда перед заголовком (пакетные отчеты)
+        self.has_data = False
+        self.data = {}              # полные массивы объектов: имя -> (x, y) или (x, нижняя, верхняя)
+        self.xlim = self.ylim = None
+        self.xticks = None
+        self.backgrounds = {}       # вид -> сохраненный фон холста
+        self.background_state = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        ax.callbacks.connect("xlim_changed", lambda ax: self.resample())
+
+    # -------------------------- ДАННЫЕ И ВИД --------------------------
+    def update(self, years_obs, y, years, trend, forecast, lower, upper, view=None):
+        """Новые данные для постоянных объектов; фон перерисовывается только при смене масштаба"""
+        years_obs, years = np.asarray(years_obs, dtype=float), np.asarray(years, dtype=float)
+        self.data = {
+            "observed": (years_obs, np.asarray(y, dtype=float)),
+            "trend": (years, trend),
+            "forecast": (years, forecast),
+            "band": (years, lower, upper),
+        }
+        first_data, self.has_data = not self.has_data, True
+
+        # Масштаб общий для всех видов, чтобы переключение вида не меняло фон
+        x = np.concatenate([years_obs, years])
+        values = np.concatenate([y, trend, forecast, lower, upper])
+        xlim = _axis_limits(x.min(), x.max(), self.xlim)
+        ylim = _axis_limits(values.min(), values.max(), self.ylim)
+        xticks = tuple(years[::2].tolist()) if len(years) <= 2 * MAX_YEAR_TICKS else None
+
+        # Масштаб, измененный пользователем (лупа, сдвиг), сбрасывается при пересчете
+        zoomed = (self.ax.get_xlim(), self.ax.get_ylim()) != (self.xlim, self.ylim)
+        static_changed = zoomed or (xlim, ylim, xticks) != (self.xlim, self.ylim, self.xticks)
+        self.xlim, self.ylim, self.xticks = xlim, ylim, xticks
+        if static_changed:
+            if xticks is None:
+                self.ax.xaxis.set_major_locator(MaxNLocator(nbins=MAX_YEAR_TICKS, integer=True))
+            else:
+                self.ax.set_xticks(xticks)
+            self.ax.set_ylim(ylim)
+            self.ax.set_xlim(xlim, emit=False)  # прореживание ниже, один раз
+        self.resample()
+
+        # Легенда и заголовок меняются только вместе с видом
+        view = view or self.view
+        if first_data or view != self.view:
+            self.apply_view(view)
+        self.refresh(full=static_changed or first_data)
+
+    def resample(self):
+        """
+        Данные объектов для видимого диапазона по x: длинные ряды прореживаются
+        до ширины области графика в пикселях, маркеры скрываются при густых точках
+        """
+        if not self.data:
+            return
+
+        xmin, xmax = sorted(self.ax.get_xlim())
+        n_bins = max(int(self.ax.bbox.width), 100)
+
+        for name, line in self.lines.items():
+            x, y = self.data[name]
+            visible = _visible_slice(x, xmin, xmax)
+            line.set_data(*minmax_decimate(x[visible], y[visible], n_bins))
+            dense = visible.stop - visible.start > MARKER_LIMIT
+            line.set_marker("None" if dense else MARKERS[name])
+
+        x, lower, upper = self.data["band"]
+        visible = _visible_slice(x, xmin, xmax)
+        x, lower, upper = envelope_decimate(x[visible], lower[visible], upper[visible], n_bins)
+        self.band.set_verts([np.column_stack([
+            np.concatenate([x, x[::-1]]),
+            np.concatenate([lower, upper[::-1]]),
+        ])])
+
+    def show(self, result, view=None):
+        """График для одного ряда ForecastResult: наблюдения, тренд, прогноз и интервал"""
+        a0, a1, a2 = result.coeffs
+        years = result.year
+
+        # Годы наблюдений начинаются с первого года прогноза
+        years_obs = years[0] + np.arange(len(result.y))
+
+        # Значения тренда для всех годов прогноза
+        t = np.arange(1, len(years) + 1)
+        trend = a0 + a1 * t + a2 * t ** 2
+
+        self.update(years_obs, result.y, years, trend,
+                    result.forecast, result.lower, result.upper, view=view)
+
+    def set_label(self, label):
+        """Подпись ряда в заголовке; применяется при следующем обновлении"""
+        if label != self.label:
+            self.label = label
+            self.has_data = False  # заголовок и фон будут перестроены
+
+    def set_view(self, view):
+        """Смена вида без пересчета; фон берется из кэша, если вид уже показывался"""
+        if view != self.view:
+            self.apply_view(view)
+        self.refresh()
+
+    def apply_view(self, view):
+        """Видимость, стиль и легенда объектов для вида"""
+        self.view = view
+        title, styles = VIEWS[view]
+
+        for name, artist in self.artists.items():
+            style = styles.get(name)
+            artist.set_visible(self.has_data and style is not None)
+            if style is not None:
+                artist.set(**style)
+
+        if self.has_data:
+            self.title.set_text(f"{self.label}: {title}" if self.label else title)
+            handles = [artist for name, artist in self.artists.items() if name in styles]
+            self.legend = self.ax.legend(handles=handles, loc='best', fontsize=10,
+                                         framealpha=0.9, shadow=True)
+
+    def clear(self, message):
+        """Пустой график с сообщением вместо заголовка"""
+        self.has_data = False
+        for artist in self.artists.values():
+            artist.set_visible(False)
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+        self.title.set_text(message)
+        self.refresh(full=True)
+
+    # -------------------------- ОТРИСОВКА --------------------------
+    def on_draw(self, event):
+        """Полная отрисовка холста: сохранение фона вида и вывод динамического слоя"""
+        if self.canvas.is_saving():
+            return
+
+        # После изменения размера или масштаба (лупа, сдвиг) фоны остальных видов устарели
+        state = (self.fig.bbox.bounds, self.ax.get_xlim(), self.ax.get_ylim())
+        if state != self.background_state:
+            self.backgrounds.clear()
+            self.background_state = state
+        self.backgrounds[self.view] = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_dynamic()
+
+    def draw_dynamic(self):
+        for artist in [self.band, *self.lines.values()]:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def refresh(self, full=False):
+        """Blitting динамического слоя поверх фона или полная перерисовка"""
+        if full:
+            self.backgrounds.clear()
+        background = self.backgrounds.get(self.view)
+        if background is None:
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(background)
+        self.draw_dynamic()
+        self.canvas.blit(self.fig.bbox)
+
+    def savefig(self, path, **kwargs):
+        """Сохранение в файл (при сохранении оси рисуют и объекты с animated)"""
+        try:
+            self.fig.savefig(path, **kwargs)
+        finally:
+            # Фон, сохраненный во время печати, не подходит для экрана
+            self.canvas.draw()
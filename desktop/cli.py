@@ -0,0 +1,262 @@
+"""
+Пакетный режим без графического интерфейса:
+
+    python desktop forecast --input panel.csv --alpha 0.0625 --horizon 13 --out results.csv
+    python desktop report --input panel.csv --out report.pdf
+    python desktop backtest --input panel.csv --steps 3
+    python desktop bench
+    python desktop serve --port 8765
+
+Загружает только вычислительное ядро (numpy): tkinter, matplotlib, seaborn
+и pandas не импортируются, pyarrow — только для Parquet и Arrow, openpyxl — для Excel.
+"""
+import argparse
+import sys
+
+from engine import (BACKTEST_COLUMNS, DTYPES, backtest, calculate_forecast_batch, optimize_alpha,
+                    with_bootstrap_intervals)
+from export import format_block, open_writer
+from importer import iter_panel, read_panel
+from timing import StageTimer, enable_json_log
+
+
+def panel_options(args):
+    """Параметры чтения панели (см. importer.iter_panel) из аргументов"""
+    id_column = args.id_column
+    if id_column is None and args.ids:
+        id_column = 0
+    return dict(
+        layout=args.layout,
+        columns=args.columns.split(",") if args.columns else None,
+        id_column=id_column,
+        period_column=args.period_column,
+        value_column=args.value_column,
+        header=args.header,
+        delimiter=args.delimiter,
+        sheet=args.sheet,
+    )
+
+
+def read_alpha(args, panel):
+    """Параметр сглаживания из аргументов: число или подбор для каждого ряда"""
+    if args.alpha == "auto":
+        return optimize_alpha(panel)
+
+    alpha = float(args.alpha)
+    if alpha <= 0 or alpha >= 1:
+        raise ValueError("α должен быть в диапазоне: 0 < α < 1")
+    return alpha
+
+
+def apply_intervals(args, result, first_index=0):
+    """
+    Бутстреп-интервалы вместо формульных, если они выбраны в аргументах.
+    first_index — номер первого ряда блока во входном файле (зерно ряда от него).
+    """
+    if args.intervals != "bootstrap":
+        return result
+    return with_bootstrap_intervals(result, args.level, args.n_boot, args.seed, first_index)
+
+
+def run_forecast(args):
+    """Команда forecast: прогноз для всех рядов входного файла"""
+    options = panel_options(args)
+    if args.timing_log:
+        enable_json_log(args.timing_log)
+    timer = StageTimer("forecast", profile=bool(args.profile), input=args.input, workers=args.workers)
+
+    with open_writer(args.out, excel_layout=args.excel_layout) as writer:
+        if args.workers > 1:
+            from parallel import calculate_forecast_parallel
+            with timer.stage("Чтение"):
+                ids, panel = read_panel(args.input, **options)
+            with timer.stage("Расчет"):
+                result = calculate_forecast_parallel(
+                    panel, read_alpha(args, panel), args.horizon, args.first_year,
+                    workers=args.workers, chunk_size=args.chunk_size, dtype=args.dtype
+                )
+                result = apply_intervals(args, result)
+            with timer.stage("Запись"):
+                writer.write_result(result, ids)
+        else:
+            # Чтение, расчет и запись блоками: в памяти только текущий блок рядов
+            blocks = iter_panel(args.input, chunk_rows=args.chunk_size, **options)
+            first_index = 0
+            while True:
+                with timer.stage("Чтение"):
+                    block = next(blocks, None)
+                if block is None:
+                    break
+                ids, panel = block
+                with timer.stage("Расчет"):
+                    result = calculate_forecast_batch(panel, read_alpha(args, panel), args.horizon,
+                                                      args.first_year, args.dtype)
+                    # Зерна рядов — по их номерам в файле: не зависят от --chunk-size
+                    result = apply_intervals(args, result, first_index)
+                with timer.stage("Запись"):
+                    writer.write_result(result, ids)
+                first_index += len(panel)
+
+    timer.log()
+    if args.profile:
+        timer.dump_profile(args.profile)
+
+
+def run_report(args):
+    """Команда report: графики всех рядов в PNG или многостраничный PDF"""
+    from report import render_report
+
+    ids, panel = read_panel(args.input, **panel_options(args))
+    alpha = read_alpha(args, panel)
+
+    render_report(
+        panel, alpha, args.out, ids=ids, views=args.views.split(","),
+        horizon=args.horizon, first_year=args.first_year,
+        workers=args.workers, dpi=args.dpi
+    )
+
+
+def run_backtest(args):
+    """Команда backtest: MAE/RMSE/MAPE по шагам прогноза на скользящей точке отсчета"""
+    result = None
+    for ids, panel in iter_panel(args.input, chunk_rows=args.chunk_size, **panel_options(args)):
+        block = backtest(panel, read_alpha(args, panel), args.steps, args.min_train)
+        result = block if result is None else result.merge(block)
+    if result is None:
+        raise ValueError("Файл не содержит рядов")
+
+    text = ",".join(BACKTEST_COLUMNS) + "\n"
+    text += format_block(result.summary(), ["%d", "%d", "%.6g", "%.6g", "%.4g"])
+    if args.out == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def run_bench(args):
+    """Команда bench: замеры движка и сравнение с базовой линией (1 — есть регрессии)"""
+    import bench
+
+    if args.accuracy:
+        bench.accuracy(args.quick)
+        return 0
+
+    results = bench.run(args.quick, args.filter, args.min_time)
+    if args.save:
+        bench.save_baseline(results, args.save)
+        print(f"Базовая линия сохранена: {args.save}")
+        return 0
+
+    baseline = bench.load_baseline(args.baseline)
+    regressions = bench.compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"РЕГРЕССИЯ {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def run_serve(args):
+    """Локальный HTTP/JSON-сервис прогноза (см. service.py)"""
+    from service import serve
+
+    serve(args.host, args.port, window=args.window_ms / 1000,
+          max_batch=args.max_batch, max_pending=args.max_pending)
+
+
+def add_input_arguments(command):
+    """Общие аргументы команд: входная панель и параметры прогноза"""
+    command.add_argument("--input", default="-",
+                         help="CSV, .xlsx, .parquet или .npy; '-' — стандартный ввод (CSV)")
+    command.add_argument("--layout", choices=["wide", "long"], default="wide",
+                         help="wide — строка на ряд, long — строка (ряд, период, значение)")
+    command.add_argument("--ids", action="store_true", help="первый столбец — идентификатор ряда")
+    command.add_argument("--id-column", help="столбец идентификатора ряда (имя или номер с нуля)")
+    command.add_argument("--columns", help="wide: столбцы значений через запятую (по умолчанию все)")
+    command.add_argument("--period-column", default="1", help="long: столбец периода")
+    command.add_argument("--value-column", default="2", help="long: столбец значения")
+    command.add_argument("--header", action="store_true", help="первая строка CSV/Excel — заголовок")
+    command.add_argument("--delimiter", default=",", help="разделитель столбцов CSV")
+    command.add_argument("--sheet", help="лист Excel (по умолчанию первый)")
+    command.add_argument("--alpha", default="0.0625", help="параметр сглаживания или 'auto' для подбора")
+    command.add_argument("--horizon", type=int, default=13, help="горизонт прогноза в периодах")
+    command.add_argument("--first-year", type=int, default=2004, help="метка первого периода прогноза")
+
+
+def build_parser():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        prog="desktop",
+        description="Прогнозирование методом экспоненциального сглаживания без графического интерфейса"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    forecast = commands.add_parser("forecast", help="прогноз для панели рядов")
+    add_input_arguments(forecast)
+    forecast.add_argument("--workers", type=int, default=1, help="число процессов (больше 1 — параллельный режим)")
+    forecast.add_argument("--chunk-size", type=int, default=20000, help="строк в блоке чтения, расчета и записи")
+    forecast.add_argument("--out", default="-",
+                          help="CSV, .parquet, .arrow/.feather, .xlsx или .npz; '-' — стандартный вывод (CSV)")
+    forecast.add_argument("--dtype", choices=DTYPES, default="float64",
+                          help="точность панели и полей прогноза (тренд всегда в float64)")
+    forecast.add_argument("--excel-layout", choices=["long", "sheets"], default="long",
+                          help="xlsx: общий лист прогноза или лист на каждый ряд")
+    forecast.add_argument("--intervals", choices=["formula", "bootstrap"], default="formula",
+                          help="доверительные интервалы: формула или бутстреп остатков тренда")
+    forecast.add_argument("--level", type=float, default=0.95, help="bootstrap: уровень интервала")
+    forecast.add_argument("--n-boot", type=int, default=2000, help="bootstrap: число повторов")
+    forecast.add_argument("--seed", type=int, default=0, help="bootstrap: зерно генератора")
+    forecast.add_argument("--timing-log", help="дописать JSON-строку с длительностями этапов в файл")
+    forecast.add_argument("--profile", help="сохранить профиль cProfile этапов в файл")
+    forecast.set_defaults(func=run_forecast)
+
+    report = commands.add_parser("report", help="графики всех рядов (PNG или PDF)")
+    add_input_arguments(report)
+    report.add_argument("--views", default="all,forecast,trend",
+                        help="виды графика через запятую: all, forecast, trend")
+    report.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — все ядра)")
+    report.add_argument("--dpi", type=int, default=100, help="разрешение изображений")
+    report.add_argument("--out", required=True, help="каталог для PNG или файл .pdf")
+    report.set_defaults(func=run_report)
+
+    backtest_command = commands.add_parser("backtest", help="точность прогноза на скользящей точке отсчета")
+    add_input_arguments(backtest_command)
+    backtest_command.add_argument("--steps", type=int, default=3, help="шагов прогноза от каждой точки отсчета")
+    backtest_command.add_argument("--min-train", type=int, default=3, help="наблюдений в первой точке отсчета")
+    backtest_command.add_argument("--chunk-size", type=int, default=20000, help="строк в блоке чтения")
+    backtest_command.add_argument("--out", default="-", help="CSV с метриками по шагам; '-' — стандартный вывод")
+    backtest_command.set_defaults(func=run_backtest)
+
+    bench = commands.add_parser("bench", help="замеры производительности движка")
+    bench.add_argument("--quick", action="store_true", help="сокращенный набор меньших размеров")
+    bench.add_argument("--filter", help="только замеры, имя которых содержит строку")
+    bench.add_argument("--accuracy", action="store_true", help="отчет о точности float32 против float64")
+    bench.add_argument("--min-time", type=float, default=0.5, help="минимальное время замера, с")
+    bench.add_argument("--baseline", default=None, help="файл базовой линии (по умолчанию bench_baseline.json)")
+    bench.add_argument("--tolerance", type=float, default=0.3, help="допустимое отклонение от базовой линии")
+    bench.add_argument("--save", help="записать результаты как базовую линию в файл")
+    bench.set_defaults(func=run_bench)
+
+    serve_command = commands.add_parser("serve", help="локальный HTTP/JSON-сервис прогноза")
+    serve_command.add_argument("--host", default="127.0.0.1", help="адрес (по умолчанию только локальный)")
+    serve_command.add_argument("--port", type=int, default=8765, help="порт; 0 — любой свободный")
+    serve_command.add_argument("--window-ms", type=float, default=2.0,
+                               help="окно объединения запросов в пакет, мс")
+    serve_command.add_argument("--max-batch", type=int, default=4096, help="рядов в одном пакете")
+    serve_command.add_argument("--max-pending", type=int, default=1000,
+                               help="ожидающих запросов, сверх которых отвечать 429")
+    serve_command.set_defaults(func=run_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args) or 0
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
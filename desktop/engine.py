@@ -0,0 +1,653 @@
+"""
+Вычислительное ядро: экспоненциальное сглаживание квадратичного тренда
+"""
+from functools import lru_cache
+
+import numpy as np
+
+FORECAST_COLUMNS = [
+    "Год", "S1", "S2", "S3", "A0", "A1", "A2",
+    "Прогноз", "Ошибка", "Верхняя", "Нижняя"
+]
+FORECAST_FIELDS = [
+    "year", "s1", "s2", "s3", "a0", "a1", "a2",
+    "forecast", "error", "upper", "lower"
+]
+
+# Точность полей прогноза: float32 вдвое сокращает память и трафик больших панелей
+DTYPES = ("float64", "float32")
+
+# Элементов панели в одном блоке подгонки тренда (копия блока в float64)
+TREND_CHUNK = 2 ** 20
+
+# Проекторы тренда кэшируются только для рядов не длиннее (запись — около 48·n байт)
+TREND_CACHE_MAX_N = 65536
+
+
+class ForecastResult:
+    """
+    Результат расчёта без округления: data и y — в точности расчета (float64
+    или float32), коэффициенты тренда и α — всегда float64.
+    data — массив (len(FORECAST_FIELDS), [n_series,] horizon): по строке на поле,
+    поэтому result.forecast и другие поля — непрерывные представления без копий.
+    """
+    __slots__ = ("data", "coeffs", "y", "alpha")
+
+    def __init__(self, data, coeffs, y, alpha):
+        self.data = data
+        self.coeffs = coeffs
+        self.y = y
+        self.alpha = alpha
+
+    def __getattr__(self, name):
+        if name in FORECAST_FIELDS:
+            return self.data[FORECAST_FIELDS.index(name)]
+        raise AttributeError(name)
+
+    @property
+    def horizon(self):
+        return self.data.shape[-1]
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays())
+
+    def arrays(self):
+        """Все массивы результата (для кэша и сериализации)"""
+        return [a for a in (self.data, self.coeffs, self.y, self.alpha) if isinstance(a, np.ndarray)]
+
+    def series(self, i):
+        """Результат для одного ряда панели (представление без копирования)"""
+        return ForecastResult(self.data[:, i], self.coeffs[i], self.y[i], self.alpha[i])
+
+    def to_pandas(self):
+        """DataFrame с русскими заголовками поверх тех же данных, без копирования"""
+        import pandas as pd
+
+        index = None
+        if self.data.ndim == 3:
+            _, n_series, horizon = self.data.shape
+            index = pd.MultiIndex.from_product(
+                [range(n_series), range(1, horizon + 1)], names=["Ряд", "Шаг"]
+            )
+        values = self.data.reshape(len(FORECAST_FIELDS), -1).T
+        return pd.DataFrame(values, columns=FORECAST_COLUMNS, index=index, copy=False)
+
+
+def _trend_basis(n):
+    """
+    МНК-проектор квадратичного тренда для рядов длины n. Для коротких рядов
+    берется из кэша; длинные (больше TREND_CACHE_MAX_N) считаются заново за O(n),
+    чтобы кэш не удерживал сотни мегабайт.
+    """
+    if n <= TREND_CACHE_MAX_N:
+        return _cached_trend_basis(n)
+    return _build_trend_basis(n)
+
+
+def _build_trend_basis(n):
+    """
+    МНК-проектор квадратичного тренда для рядов длины n.
+
+    Вместо плохо обусловленного базиса [1, t, t²] используется u = (t - c) / h
+    на [-1, 1] (c — середина, h — полуразмах t = 1..n) и ортогональные на этой
+    сетке многочлены 1, u, u² - m (m — среднее u²). Коэффициенты в базисе
+    [1, u, u²] — b = y @ projector.T без SVD; to_t переводит их в A0, A1, A2 по t.
+    Возвращает (basis (3, n), projector (3, n), to_t (3, 3)) только для чтения.
+    """
+    if n < 3:
+        raise ValueError("Для квадратичного тренда нужно не меньше 3 наблюдений")
+
+    c, h = (n + 1) / 2, (n - 1) / 2
+    u = (np.arange(1, n + 1) - c) / h
+    u2 = u * u
+    m = u2.mean()
+    q1, q2 = u, u2 - m
+
+    # Проекции на ортогональные многочлены, затем переход к [1, u, u²]: b0 = β0 - m·β2
+    rows = [np.full(n, 1 / n), q1 / (q1 @ q1), q2 / (q2 @ q2)]
+    projector = np.vstack([rows[0] - m * rows[2], rows[1], rows[2]])
+    basis = np.vstack([np.ones(n), u, u2])
+
+    # A(t) = b0 + b1·(t - c)/h + b2·((t - c)/h)²
+    to_t = np.array([
+        [1, -c / h, c * c / (h * h)],
+        [0, 1 / h, -2 * c / (h * h)],
+        [0, 0, 1 / (h * h)],
+    ])
+
+    for array in (basis, projector, to_t):
+        array.setflags(write=False)
+    return basis, projector, to_t
+
+
+# Не больше 16 записей по ~3 МБ
+_cached_trend_basis = lru_cache(maxsize=16)(_build_trend_basis)
+
+
+def _fit_trend(y, residuals=False):
+    """
+    Коэффициенты квадратичного тренда (A0, A1, A2 по t = 1..n) для каждой
+    строки панели; для всей панели — одно матричное умножение.
+    residuals=True — еще и остатки y - тренд, посчитанные в устойчивом базисе.
+    """
+    basis, projector, to_t = _trend_basis(y.shape[1])
+    b = y @ projector.T
+    coeffs = b @ to_t.T
+    if residuals:
+        return coeffs, y - b @ basis
+    return coeffs
+
+
+def _trend_stats(y):
+    """
+    Коэффициенты тренда (n_series, 3) и СКО остатков (n_series, 1) в float64
+    для панели любой точности. Суммы МНК накапливаются в float64 по блокам строк,
+    поэтому копия float32-панели в float64 не больше TREND_CHUNK элементов.
+    """
+    n_series, n_obs = y.shape
+    step = max(1, TREND_CHUNK // n_obs)
+    if n_series <= step:
+        return _block_trend_stats(np.asarray(y, dtype=np.float64))
+
+    coeffs = np.empty((n_series, 3))
+    kvadr = np.empty((n_series, 1))
+    for lo in range(0, n_series, step):
+        coeffs[lo:lo + step], kvadr[lo:lo + step] = _block_trend_stats(
+            np.asarray(y[lo:lo + step], dtype=np.float64))
+    return coeffs, kvadr
+
+
+def _block_trend_stats(y):
+    """Коэффициенты тренда и СКО остатков блока строк float64"""
+    coeffs, residuals = _fit_trend(y, residuals=True)
+    residuals -= residuals.mean(axis=1, keepdims=True)
+    return coeffs, np.sqrt(np.sum(residuals ** 2, axis=1, keepdims=True) / (y.shape[1] - 1))
+
+
+def _initial_s0(a0, a1, a2, alpha):
+    """Начальные S01, S02, S03 по формулам из документа"""
+    s01 = a0 - a1 * (1 - alpha) / alpha + a2 * (1 - alpha) * (2 - alpha) / (2 * alpha ** 2)
+    s02 = a0 - 2 * a1 * (1 - alpha) / alpha + a2 * (1 - alpha) * (3 - 2 * alpha) / (alpha ** 2)
+    s03 = a0 - 3 * a1 * (1 - alpha) / alpha + 3 * a2 * (1 - alpha) * (4 - 3 * alpha) / (2 * alpha ** 2)
+    return s01, s02, s03
+
+
+def _smoothed_coeffs(s1, s2, s3, alpha):
+    """Коэффициенты прогноза A0, A1, A2 по экспоненциальным средним"""
+    a0_qua = 3 * (s1 - s2) + s3
+    remp = (6 - 5 * alpha) * s1 - 2 * (5 - 4 * alpha) * s2 + (4 - 3 * alpha) * s3
+    a1_qua = remp * alpha / (2 * (1 - alpha) ** 2)
+    a2_qua = (s1 - 2 * s2 + s3) * alpha ** 2 / ((1 - alpha) ** 2)
+    return a0_qua, a1_qua, a2_qua
+
+
+def _first_coeffs(a0, a1, a2, alpha):
+    """A0, A1, A2 первого шага прогноза по коэффициентам тренда"""
+    s01, s02, s03 = _initial_s0(a0, a1, a2, alpha)
+    s1 = alpha * (a0 + a1 + a2) + (1 - alpha) * s01
+    s2 = alpha * s1 + (1 - alpha) * s02
+    s3 = alpha * s2 + (1 - alpha) * s03
+    return _smoothed_coeffs(s1, s2, s3, alpha)
+
+
+def _coeff_path(a0, a1, a2, alpha, horizon, dtype=np.float64):
+    """
+    A0, A1, A2 на шагах 1..horizon (по последней оси) без пошагового цикла.
+
+    Шаг сглаживания линеен по (S1, S2, S3): S(j+1) = M·S(j), где M = C⁻¹·U·C,
+    C переводит S в A, а U сдвигает квадратичный тренд на один период:
+    A0' = A0 + A1 + A2/2, A1' = A1 + A2, A2' = A2. Поэтому A(j) = U^(j-1)·A(1)
+    считается сразу для всех j, а S(j) = C⁻¹·A(j) дают формулы S0.
+    A(1) (с сокращениями в формулах S0) считается в float64, путь — в dtype.
+    """
+    b0, b1, b2 = (np.expand_dims(c, -1).astype(dtype, copy=False)
+                  for c in _first_coeffs(a0, a1, a2, alpha))
+    k = np.arange(horizon, dtype=dtype)
+    return b0 + b1 * k + 0.5 * b2 * k ** 2, b1 + b2 * k, b2 * np.ones(horizon, dtype=dtype)
+
+
+def _forecast_table(coeffs, kvadr, alpha, horizon, first_year, dtype=np.float64):
+    """
+    Поля прогноза (len(FORECAST_FIELDS), n_series, horizon) в точности dtype
+    по коэффициентам тренда (n_series, 3), СКО остатков и α формы (n_series, 1)
+    """
+    # 1. Коэффициенты и экспоненциальные средние на всём горизонте
+    a0_qua, a1_qua, a2_qua = _coeff_path(*coeffs.T, alpha[:, 0], horizon, dtype)
+    alpha, kvadr = alpha.astype(dtype, copy=False), kvadr.astype(dtype, copy=False)
+    s1, s2, s3 = _initial_s0(a0_qua, a1_qua, a2_qua, alpha)
+
+    # 2. Прогноз, ошибка и доверительные интервалы
+    j = np.arange(1, horizon + 1, dtype=dtype)
+    forecast = a0_qua + a1_qua * j + 0.5 * a2_qua * j ** 2
+    err = kvadr * np.sqrt(2 * alpha + 3 * alpha ** 2 + 3 * (alpha ** 3) * (j ** 2))
+    year = np.broadcast_to(first_year + j - 1, forecast.shape)
+
+    return np.stack([
+        year, s1, s2, s3, a0_qua, a1_qua, a2_qua,
+        forecast, err, forecast + err, forecast - err
+    ])
+
+
+def _check_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype.name not in DTYPES:
+        raise ValueError(f"Точность расчета {dtype.name} не поддерживается: {', '.join(DTYPES)}")
+    return dtype
+
+
+def calculate_forecast_batch(panel, alpha, horizon=13, first_year=2004, dtype=np.float64):
+    """
+    Прогноз сразу для панели рядов формы (n_series, n_obs).
+    alpha — скаляр или массив длины n_series, first_year — метка первого
+    периода прогноза. dtype — точность панели и полей прогноза (float64 или
+    float32); тренд и коэффициенты первого шага считаются в float64 при любой.
+    Возвращает ForecastResult с полями формы (n_series, horizon).
+    """
+    dtype = _check_dtype(dtype)
+    y = np.array(panel, dtype=dtype, ndmin=2)
+    n_series, n_obs = y.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,)).copy()
+
+    # 1. Квадратичный тренд (полином 2-й степени) и среднеквадратическая ошибка
+    coeffs, kvadr = _trend_stats(y)
+
+    # 2. Прогноз на заданный горизонт для всех рядов одновременно
+    data = _forecast_table(coeffs, kvadr, alpha[:, None], horizon, first_year, dtype)
+
+    return ForecastResult(data, coeffs, y, alpha)
+
+
+def calculate_forecast(values, alpha, horizon=13, first_year=2004, cache=None, dtype=np.float64):
+    """
+    Прогнозирование методом экспоненциального сглаживания квадратичного тренда.
+    cache — необязательный ForecastCache для повторных расчётов с теми же данными.
+    Округление для отчёта выполняется только при отображении.
+    """
+    compute = calculate_forecast_batch if cache is None else cache.forecast_batch
+    return compute([values], alpha, horizon, first_year, dtype).series(0)
+
+
+# Элементов массива повторов (ряды × повторы × точки) в одном блоке бутстрепа
+BOOTSTRAP_CHUNK = 2 ** 22
+
+
+def bootstrap_quantiles(panel, alpha, quantiles=(0.025, 0.975), horizon=13, n_boot=2000, seed=0,
+                        first_index=0):
+    """
+    Эмпирические квантили прогноза на шагах 1..horizon по бутстрепу остатков тренда.
+
+    Остатки квадратичного тренда (с поправкой √(n/(n-3)) на подгонку) выбираются
+    с возвращением: тренд каждого повтора получается тем же проектором
+    (МНК линеен, поэтому достаточно спроецировать выборку остатков), сглаживание
+    дает прогноз повтора, к которому добавляется выбранный остаток будущего шага.
+    Все повторы считаются одним массивом. У каждого ряда свой генератор
+    с зерном (seed, first_index + номер ряда), поэтому интервалы ряда не зависят
+    от состава панели, разбиения на блоки и числа процессов; first_index — номер
+    первого ряда панели во входных данных. Возвращает (len(quantiles), n_series, horizon).
+    """
+    y = np.array(panel, dtype=float, ndmin=2)
+    n_series, n_obs = y.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,))
+    seed = np.ravel(seed).tolist()
+
+    basis, projector, to_t = _trend_basis(n_obs)
+    b = y @ projector.T
+    residuals = (y - b @ basis) * np.sqrt(n_obs / max(n_obs - 3, 1))
+
+    j = np.arange(1, horizon + 1)[:, None]
+    out = np.empty((len(quantiles), n_series, horizon))
+    step = max(1, BOOTSTRAP_CHUNK // (n_boot * (n_obs + horizon)))
+    for lo in range(0, n_series, step):
+        hi = min(lo + step, n_series)
+
+        # Выборка остатков: номера на тренд и шум из генератора ряда — построчно,
+        # чтобы буфер номеров был размером с один ряд, а не с блок
+        sample = np.empty((hi - lo, n_boot, n_obs))
+        noise = np.empty((hi - lo, horizon, n_boot))
+        for k in range(hi - lo):
+            rng = np.random.default_rng([*seed, first_index + lo + k])
+            draws = rng.integers(0, n_obs, size=n_boot * (n_obs + horizon))
+            np.take(residuals[lo + k], draws[:n_boot * n_obs], out=sample[k].reshape(-1))
+            np.take(residuals[lo + k], draws[n_boot * n_obs:], out=noise[k].reshape(-1))
+        del draws
+
+        # 1. Тренд повторов: b* = b + e*·P
+        coeffs = (b[lo:hi, None, :] + sample @ projector.T) @ to_t.T
+
+        # 2. Прогноз повторов (многочлен от j, см. _alpha_scores) в раскладке
+        #    (ряд, шаг, повтор): квантили берутся по непрерывной последней оси
+        b0, b1, b2 = _first_coeffs(*np.moveaxis(coeffs, -1, 0), alpha[lo:hi, None])
+        c0, c1, c2 = (c[:, None, :] for c in (b0 - b1 + 0.5 * b2, 2 * (b1 - b2), 2 * b2))
+        out[:, lo:hi] = np.quantile(c0 + c1 * j + c2 * j ** 2 + noise, quantiles, axis=-1)
+    return out
+
+
+def with_bootstrap_intervals(result, level=0.95, n_boot=2000, seed=0, first_index=0):
+    """
+    Копия ForecastResult с эмпирическими границами уровня level вместо формулы:
+    «Верхняя»/«Нижняя» — квантили бутстрепа, «Ошибка» — половина ширины интервала.
+    """
+    if result.y is None:
+        raise ValueError("Для бутстрепа нужен исходный ряд")
+    if not 0 < level < 1:
+        raise ValueError("Уровень интервала должен быть в диапазоне: 0 < level < 1")
+
+    lower, upper = bootstrap_quantiles(result.y, result.alpha, ((1 - level) / 2, (1 + level) / 2),
+                                       result.horizon, n_boot, seed, first_index)
+    data = result.data.copy()
+    if data.ndim == 2:
+        lower, upper = lower[0], upper[0]
+    data[FORECAST_FIELDS.index("lower")] = lower
+    data[FORECAST_FIELDS.index("upper")] = upper
+    data[FORECAST_FIELDS.index("error")] = (upper - lower) / 2
+    return ForecastResult(data, result.coeffs, result.y, result.alpha)
+
+
+def _alpha_scores(y, alpha, method, holdout):
+    """
+    Среднеквадратическая ошибка прогноза для каждой пары (ряд, α).
+    y — панель (n_series, n_obs), alpha — (n_grid,) или (n_series, n_grid).
+    """
+    n_obs = y.shape[1]
+    if method == "insample":
+        # Прогноз на шагах 1..n сравнивается со всеми наблюдениями
+        fitted, target = y, y
+    elif method == "holdout":
+        # Тренд строится без последних holdout точек, они служат проверкой
+        if not 3 <= n_obs - holdout < n_obs:
+            raise ValueError("holdout должен оставлять не меньше 3 точек для тренда")
+        fitted, target = y[:, :n_obs - holdout], y[:, n_obs - holdout:]
+    else:
+        raise ValueError(f"Неизвестный метод оценки α: {method}")
+
+    a0, a1, a2 = (c[:, None] for c in _fit_trend(fitted).T)
+    b0, b1, b2 = _first_coeffs(a0, a1, a2, alpha)
+
+    # Прогноз шага j — квадратичный многочлен от j (см. _coeff_path):
+    # F(j) = B0 - B1 + B2/2 + 2(B1 - B2)·j + 2B2·j².
+    # Переходим к базису [1, u, u²] с u = (j - mid) / half на участке сравнения
+    j = np.arange(n_obs - target.shape[1] + 1, n_obs + 1)
+    mid, half = (j[0] + j[-1]) / 2, max((j[-1] - j[0]) / 2, 1)
+    c0, c1, c2 = b0 - b1 + 0.5 * b2, 2 * (b1 - b2), 2 * b2
+    forecast = np.stack([
+        c0 + c1 * mid + c2 * mid ** 2,
+        (c1 + 2 * c2 * mid) * half,
+        c2 * half ** 2
+    ], axis=-1)
+
+    # Ошибка = расстояние до МНК-проекции цели на тот же базис + остаток проекции,
+    # поэтому вся сетка α оценивается без цикла по шагам
+    if target.shape[1] >= 3:
+        basis, projector, _ = _trend_basis(target.shape[1])
+        proj = projector @ target.T
+    else:
+        u = (j - mid) / half
+        basis = np.vstack([np.ones_like(u), u, u ** 2])
+        proj, *_ = np.linalg.lstsq(basis.T, target.T, rcond=None)
+    rest = np.sum((target - proj.T @ basis) ** 2, axis=1)
+
+    diff = forecast - proj.T[:, None, :]
+    sse = np.einsum("sgi,ij,sgj->sg", diff, basis @ basis.T, diff) + rest[:, None]
+
+    mse = sse / target.shape[1]
+    return np.where(np.isfinite(mse), mse, np.inf)
+
+
+def optimize_alpha(values, method="insample", holdout=3, grid_size=50,
+                   refine_size=20, bounds=(0.01, 0.99)):
+    """
+    Подбор α по сетке с последующим уточнением вокруг лучшего узла.
+    values — один ряд или панель (n_series, n_obs); для панели α подбирается
+    для каждого ряда отдельно за один векторный проход.
+    method: "insample" — ошибка на исходных точках, "holdout" — на последних
+    holdout точках при тренде, построенном без них.
+    Возвращает α (float для одного ряда, массив для панели).
+    """
+    y = np.array(values, dtype=float)
+    single = y.ndim == 1
+    y = np.atleast_2d(y)
+    rows = np.arange(y.shape[0])
+
+    # 1. Грубая сетка, общая для всех рядов
+    grid = np.linspace(bounds[0], bounds[1], grid_size)
+    best = np.argmin(_alpha_scores(y, grid, method, holdout), axis=1)
+
+    # 2. Уточнение между соседними узлами сетки для каждого ряда
+    lo = grid[np.maximum(best - 1, 0)]
+    hi = grid[np.minimum(best + 1, grid_size - 1)]
+    fine = lo[:, None] + (hi - lo)[:, None] * np.linspace(0, 1, refine_size)
+    scores = _alpha_scores(y, fine, method, holdout)
+    alpha = fine[rows, np.argmin(scores, axis=1)]
+
+    return float(alpha[0]) if single else alpha
+
+
+def _power_sum(n, k):
+    """Точная сумма t^k для t = 1..n (k = 0..4)"""
+    return [
+        n,
+        n * (n + 1) // 2,
+        n * (n + 1) * (2 * n + 1) // 6,
+        (n * (n + 1) // 2) ** 2,
+        n * (n + 1) * (2 * n + 1) * (3 * n ** 2 + 3 * n - 1) // 30,
+    ][k]
+
+
+BACKTEST_COLUMNS = ["Шаг", "Прогнозов", "MAE", "RMSE", "MAPE %"]
+
+
+class BacktestResult:
+    """
+    Ошибки прогноза на скользящей точке отсчета по шагам 1..steps.
+    Суммы хранятся по рядам (n_series, steps), поэтому результаты блоков
+    панели объединяются простым сложением (см. merge).
+    count — число точек отсчета с известным фактом для каждого шага,
+    ape_count — число слагаемых MAPE (нулевые факты пропускаются).
+    """
+    __slots__ = ("origins", "abs_err", "sq_err", "ape", "ape_count", "count")
+
+    def __init__(self, origins, abs_err, sq_err, ape, ape_count, count):
+        self.origins = origins
+        self.abs_err = abs_err
+        self.sq_err = sq_err
+        self.ape = ape
+        self.ape_count = ape_count
+        self.count = count
+
+    @property
+    def steps(self):
+        return self.abs_err.shape[1]
+
+    def merge(self, other):
+        """Объединение с результатом другого блока рядов той же длины"""
+        return BacktestResult(
+            self.origins,
+            *(np.concatenate([a, b]) for a, b in zip(
+                (self.abs_err, self.sq_err, self.ape, self.ape_count),
+                (other.abs_err, other.sq_err, other.ape, other.ape_count)
+            )),
+            self.count
+        )
+
+    def summary(self):
+        """Метрики по шагам для всей панели: массив (len(BACKTEST_COLUMNS), steps)"""
+        n = self.count * len(self.abs_err)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.stack([
+                np.arange(1, self.steps + 1),
+                n,
+                self.abs_err.sum(axis=0) / n,
+                np.sqrt(self.sq_err.sum(axis=0) / n),
+                100 * self.ape.sum(axis=0) / self.ape_count.sum(axis=0),
+            ])
+
+    def series_metrics(self):
+        """MAE, RMSE и MAPE (%) каждого ряда по шагам: три массива (n_series, steps)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.abs_err / self.count,
+                    np.sqrt(self.sq_err / self.count),
+                    100 * self.ape / self.ape_count)
+
+
+def backtest(panel, alpha, steps=3, min_train=3, origins=None):
+    """
+    Проверка точности на скользящей точке отсчета. Для каждой точки k
+    (тренд по первым k наблюдениям) прогноз на шаги 1..steps сравнивается
+    с фактом y[k + s] там, где он известен. origins — номера k (по умолчанию
+    все от min_train до n - 1). alpha — скаляр или массив длины n_series.
+
+    Тренд для всех точек получается из префиксных сумм Σt^p·y (p = 0..2)
+    без повторного МНК, все точки и ряды считаются одним векторным проходом.
+    """
+    y = np.array(panel, dtype=float, ndmin=2)
+    n_series, n_obs = y.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,))[:, None]
+
+    k = np.arange(max(min_train, 3), n_obs) if origins is None else np.unique(origins)
+    if not len(k) or k[0] < 3 or k[-1] >= n_obs:
+        raise ValueError(f"Точки отсчета должны быть от 3 до {n_obs - 1} наблюдений")
+
+    # 1. Префиксные суммы: Σ t^p·y для t ≤ k — строка k - 1
+    t = np.arange(1, n_obs + 1)
+    prefix = np.cumsum(y[:, :, None] * (t[:, None] ** np.arange(3)), axis=1)[:, k - 1]
+
+    # 2. Нормальные уравнения в масштабе t/k (как в ForecastModel.coeffs),
+    #    обратные матрицы — одна на точку отсчета, общая для всех рядов
+    scale = k[:, None].astype(float) ** np.arange(3)
+    sums = np.stack([_power_sum(k.astype(float), p) for p in range(5)], axis=-1)
+    gram = sums[:, np.add.outer(np.arange(3), np.arange(3))] / (scale[:, :, None] * scale[:, None, :])
+    coeffs = np.einsum("kij,skj->ski", np.linalg.inv(gram), prefix / scale) / scale
+
+    # 3. Прогноз шага j — квадратичный многочлен от j (см. _alpha_scores)
+    b0, b1, b2 = _first_coeffs(*np.moveaxis(coeffs, -1, 0), alpha)
+    c0, c1, c2 = (c[..., None] for c in (b0 - b1 + 0.5 * b2, 2 * (b1 - b2), 2 * b2))
+    j = k[:, None] + np.arange(1, steps + 1)
+    forecast = c0 + c1 * j + c2 * j ** 2
+
+    # 4. Ошибки там, где факт известен (j ≤ n)
+    valid = j <= n_obs
+    actual = y[:, np.minimum(j, n_obs) - 1]
+    err = np.where(valid, actual - forecast, 0.0)
+    nonzero = valid & (actual != 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ape = np.where(nonzero, np.abs(err / actual), 0.0)
+
+    return BacktestResult(
+        k,
+        np.abs(err).sum(axis=1),
+        (err ** 2).sum(axis=1),
+        ape.sum(axis=1),
+        nonzero.sum(axis=1),
+        valid.sum(axis=0),
+    )
+
+
+class ForecastModel:
+    """
+    Модель с накопленными суммами для дообучения по мере поступления данных.
+    Хранит Σt^k (k = 0..4), Σt^k·y (k = 0..2) и сумму квадратов остатков тренда,
+    поэтому новая точка обновляет тренд и СКО за O(1) без повторного МНК по всему ряду.
+    Сумма квадратов остатков обновляется приращениями (как у Уэлфорда), а не
+    разностью Σy² - A·ΣX'y: та теряет точность при большом уровне ряда.
+    """
+
+    def __init__(self, values=(), alpha=0.0625, horizon=13, first_year=2004):
+        self.alpha = alpha
+        self.horizon = horizon
+        self.first_year = first_year
+
+        self.n_obs = 0
+        self.sum_t = [0] * 5  # целые, без потери точности
+        self.sum_ty = np.zeros(3)
+        self.sse = 0.0
+
+        self._coeffs = None
+        self._result = None
+
+        self.extend(values)
+
+    def update(self, value):
+        """Добавление одного нового наблюдения"""
+        t = self.n_obs + 1
+        if self.n_obs >= 3:
+            # Рекуррентный МНК: ошибка прогноза точки по прежнему тренду с весом 1 / (1 + h)
+            gram, scale = self._scaled_gram()
+            x = np.array([1.0, t, t ** 2]) / scale
+            error = value - np.dot(self.coeffs, [1.0, t, t ** 2])
+            self.sse += error ** 2 / (1 + x @ np.linalg.solve(gram, x))
+
+        self.n_obs = t
+        for k in range(5):
+            self.sum_t[k] += t ** k
+        self.sum_ty += value * np.array([1.0, t, t ** 2])
+        self._coeffs = self._result = None
+
+    def extend(self, values):
+        """Добавление нескольких наблюдений одним векторным шагом"""
+        y = np.asarray(values, dtype=float)
+
+        # Пока тренд не определен (и для хвоста короче 3 точек) — по одной точке
+        while y.size and (self.n_obs < 3 or y.size < 3):
+            self.update(y[0])
+            y = y[1:]
+        if not y.size:
+            return
+
+        # Тренд блока и его остатки напрямую, в масштабе t/n
+        n = self.n_obs + len(y)
+        scale = np.array([1.0, n, n ** 2])
+        t = np.arange(self.n_obs + 1, n + 1)
+        design = np.stack([np.ones(len(y)), t / n, (t / n) ** 2], axis=1)
+        block, *_ = np.linalg.lstsq(design, y, rcond=None)
+        residuals = y - design @ block
+        gram_block = design.T @ design
+
+        # Объединение двух подгонок МНК: SSE = SSE₁ + SSE₂ + d'·G₁·(G₁ + G₂)⁻¹·G₂·d, d = b₁ - b₂
+        gram_old = self._scaled_gram(n)[0]
+        d = np.array(self.coeffs) * scale - block
+        self.sse += residuals @ residuals + (gram_old @ d) @ np.linalg.solve(gram_old + gram_block, gram_block @ d)
+
+        for k in range(5):
+            self.sum_t[k] += _power_sum(n, k) - _power_sum(self.n_obs, k)
+        self.sum_ty += np.array([y.sum(), (t * y).sum(), (t ** 2 * y).sum()])
+        self.n_obs = n
+        self._coeffs = self._result = None
+
+    def _scaled_gram(self, n=None):
+        """Матрица Σt^(k+m) в масштабе t/n (по умолчанию n — число наблюдений) и вектор масштаба"""
+        n = n or self.n_obs
+        scale = np.array([1.0, n, n ** 2])
+        gram = np.array([[self.sum_t[k + m] for m in range(3)] for k in range(3)], dtype=float)
+        return gram / np.outer(scale, scale), scale
+
+    @property
+    def coeffs(self):
+        """Коэффициенты квадратичного тренда (A0, A1, A2)"""
+        if self._coeffs is None:
+            if self.n_obs < 3:
+                raise ValueError("Для квадратичного тренда нужно не меньше 3 наблюдений")
+
+            # Нормальные уравнения в масштабе t/n, чтобы матрица не вырождалась
+            gram, scale = self._scaled_gram()
+            self._coeffs = np.linalg.solve(gram, self.sum_ty / scale) / scale
+        return tuple(self._coeffs)
+
+    @property
+    def kvadr(self):
+        """СКО остатков тренда: SSE / (n - 1), среднее остатков равно нулю"""
+        if self.n_obs < 3:
+            raise ValueError("Для квадратичного тренда нужно не меньше 3 наблюдений")
+        return np.sqrt(self.sse / (self.n_obs - 1))
+
+    @property
+    def result(self):
+        """ForecastResult по текущим суммам (исходный ряд не хранится, y = None)"""
+        if self._result is None:
+            coeffs = np.array(self.coeffs)
+            data = _forecast_table(
+                coeffs[None], np.array([[self.kvadr]]),
+                np.array([[self.alpha]], dtype=float), self.horizon, self.first_year
+            )[:, 0]
+            self._result = ForecastResult(data, coeffs, None, self.alpha)
+        return self._result
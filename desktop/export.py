@@ -0,0 +1,276 @@
+"""
+Потоковый экспорт результатов в длинном формате (строка — шаг прогноза ряда):
+CSV, Parquet, Arrow IPC и Excel. Запись идет блоками строк по мере расчета,
+общий DataFrame не собирается. pyarrow и openpyxl загружаются только при записи
+соответствующих форматов.
+"""
+import re
+import sys
+from itertools import chain
+
+import numpy as np
+
+from engine import FORECAST_COLUMNS
+
+RESULT_COLUMNS = ["Ряд", "α"] + FORECAST_COLUMNS
+
+# Число знаков при отображении столбцов FORECAST_COLUMNS: S и A — 4, прогноз и интервалы — 2
+DISPLAY_DECIMALS = [0, 4, 4, 4, 4, 4, 4, 2, 2, 2, 2]
+
+PARAMETER_COLUMNS = ["Ряд", "α", "A0", "A1", "A2", "Лист", "Первая строка"]
+
+# Форматы столбцов RESULT_COLUMNS для CSV (ряд — %s, чтобы подходили и строковые идентификаторы)
+CSV_FORMATS = ["%s", "%.6g", "%d"] + ["%.10g"] * (len(FORECAST_COLUMNS) - 1)
+
+# Строк в одном блоке записи: ограничивает память на форматирование и буферы pyarrow
+CHUNK_ROWS = 65536
+
+
+def format_block(columns, formats, delimiter=","):
+    """
+    Текст CSV для блока столбцов одной операцией форматирования:
+    шаблон строки повторяется по числу строк, значения идут построчно.
+    """
+    n_rows = len(columns[0])
+    if n_rows == 0:
+        return ""
+    template = (delimiter.join(formats) + "\n") * n_rows
+    return template % tuple(chain.from_iterable(zip(*[np.asarray(c).tolist() for c in columns])))
+
+
+def quote_ids(ids, delimiter=","):
+    """
+    Идентификаторы рядов как поля CSV: с разделителем, кавычкой или переводом
+    строки — в кавычках с удвоением кавычек. Числовые идентификаторы не меняются;
+    текстовые форматируются по одному разу на уникальное значение.
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind in "iuf":
+        return ids
+    special = (delimiter, '"', "\n", "\r")
+    unique, inverse = np.unique(ids.astype(str), return_inverse=True)
+    fields = np.array([
+        '"' + value.replace('"', '""') + '"' if any(c in value for c in special) else value
+        for value in unique.tolist()
+    ], dtype=object)
+    return fields[inverse.ravel()]
+
+
+def result_chunks(result, ids=None, chunk_rows=CHUNK_ROWS):
+    """
+    Блоки результата в длинном формате: списки массивов по RESULT_COLUMNS.
+    Блок содержит целые ряды, не меньше одного.
+    """
+    data = result.data if result.data.ndim == 3 else result.data[:, None, :]
+    n_cols, n_series, horizon = data.shape
+    alpha = np.broadcast_to(np.asarray(result.alpha, dtype=float), (n_series,))
+    series = np.arange(n_series) if ids is None else np.asarray(ids)
+
+    step = max(1, chunk_rows // horizon)
+    for lo in range(0, n_series, step):
+        hi = min(lo + step, n_series)
+        columns = [np.repeat(series[lo:hi], horizon), np.repeat(alpha[lo:hi], horizon)]
+        columns += list(data[:, lo:hi].reshape(n_cols, -1))
+        columns[2] = columns[2].astype(np.int64)
+        yield columns
+
+
+class ResultWriter:
+    """Базовый класс потоковой записи: write() принимает блоки столбцов RESULT_COLUMNS"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_result(self, result, ids=None, chunk_rows=CHUNK_ROWS):
+        """Запись ForecastResult (один ряд или панель) блоками строк"""
+        for columns in result_chunks(result, ids, chunk_rows):
+            self.write(columns)
+
+    def write(self, columns):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvWriter(ResultWriter):
+    """CSV с векторизованным форматированием блока; '-' — стандартный вывод"""
+
+    def __init__(self, path, delimiter=","):
+        super().__init__(path)
+        self.delimiter = delimiter
+        self.stream = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        self.stream.write(delimiter.join(RESULT_COLUMNS) + "\n")
+
+    def write(self, columns):
+        columns = [quote_ids(columns[0], self.delimiter)] + list(columns[1:])
+        self.stream.write(format_block(columns, CSV_FORMATS, self.delimiter))
+        self.rows += len(columns[0])
+
+    def close(self):
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+
+class ArrowWriter(ResultWriter):
+    """Arrow IPC (файловый формат) или Parquet: блок — группа строк / пакет записей"""
+
+    def __init__(self, path, parquet=False):
+        super().__init__(path)
+        self.parquet = parquet
+        self.schema = None
+        self.writer = None
+
+    def write(self, columns):
+        import pyarrow as pa
+
+        if self.writer is None:
+            # Схема по первому блоку: тип столбца «Ряд» зависит от идентификаторов
+            self.schema = pa.schema(
+                [(name, pa.array(column[:0]).type) for name, column in zip(RESULT_COLUMNS, columns)]
+            )
+            if self.parquet:
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = pa.ipc.new_file(self.path, self.schema)
+
+        self.writer.write_batch(pa.record_batch([pa.array(column) for column in columns], schema=self.schema))
+        self.rows += len(columns[0])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class NpzWriter(ResultWriter):
+    """
+    .npz с массивами в исходной форме (ряд, шаг). Формат не потоковый:
+    блоки накапливаются и сохраняются при закрытии.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.blocks = []
+        self.ids = []
+
+    def write_result(self, result, ids=None, chunk_rows=CHUNK_ROWS):
+        data = result.data if result.data.ndim == 3 else result.data[:, None, :]
+        coeffs = np.atleast_2d(result.coeffs)
+        alpha = np.broadcast_to(np.asarray(result.alpha, dtype=float), (data.shape[1],))
+        start = sum(len(block[2]) for block in self.blocks)
+        self.blocks.append((data, coeffs, alpha))
+        self.ids.append(np.arange(start, start + data.shape[1]) if ids is None else np.asarray(ids))
+        self.rows += data.shape[1] * data.shape[2]
+
+    def close(self):
+        if not self.blocks:
+            return
+        data, coeffs, alpha = (np.concatenate(parts, axis=axis)
+                               for parts, axis in zip(zip(*self.blocks), (1, 0, 0)))
+        np.savez(self.path, data=data, coeffs=coeffs, alpha=alpha, ids=np.concatenate(self.ids))
+
+
+class ExcelWriter(ResultWriter):
+    """
+    .xlsx через openpyxl в режиме write_only: строки сразу уходят во временные
+    файлы листов, память не растет с числом рядов. Значения округляются как в таблице.
+    layout="long" — общий лист «Прогноз» (с продолжением на следующих листах
+    у предела строк Excel), "sheets" — отдельный лист на каждый ряд.
+    Лист «Параметры» — α и A0–A2 каждого ряда, лист и строка начала его прогноза.
+    """
+
+    MAX_ROWS = 1048576
+
+    def __init__(self, path, layout="long"):
+        from openpyxl import Workbook
+
+        if layout not in ("long", "sheets"):
+            raise ValueError(f"Неизвестная раскладка Excel: {layout}")
+
+        super().__init__(path)
+        self.layout = layout
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+        self.titles = set()
+
+        if layout == "long":
+            self.new_sheet("Прогноз", RESULT_COLUMNS)
+        self.params = self.workbook.create_sheet("Параметры", 0 if layout == "sheets" else None)
+        self.params.append(PARAMETER_COLUMNS)
+
+    def new_sheet(self, title, header):
+        """Новый лист с заголовком; имя приводится к ограничениям Excel"""
+        title = re.sub(r"[\[\]:*?/\\]", "_", str(title))[:31]
+        base, k = title, 2
+        while title in self.titles:
+            title = f"{base[:31 - len(str(k)) - 3]} ({k})"
+            k += 1
+        self.titles.add(title)
+
+        # Заполненный лист закрывается: его строки уже во временном файле
+        if self.sheet is not None:
+            self.sheet.close()
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheet.append(header)
+        self.sheet_rows = 1
+
+    def write_result(self, result, ids=None, chunk_rows=CHUNK_ROWS):
+        data = result.data if result.data.ndim == 3 else result.data[:, None, :]
+        n_cols, n_series, horizon = data.shape
+        coeffs = np.atleast_2d(result.coeffs)
+        alpha = np.broadcast_to(np.asarray(result.alpha, dtype=float), (n_series,))
+        series = np.arange(n_series) if ids is None else np.asarray(ids)
+
+        step = max(1, chunk_rows // horizon)
+        for lo in range(0, n_series, step):
+            hi = min(lo + step, n_series)
+            block = [np.round(data[i, lo:hi], d).tolist() for i, d in enumerate(DISPLAY_DECIMALS)]
+            block[0] = data[0, lo:hi].astype(np.int64).tolist()
+
+            for j, name, a, (a0, a1, a2) in zip(range(hi - lo), series[lo:hi].tolist(),
+                                                 alpha[lo:hi].tolist(), coeffs[lo:hi].tolist()):
+                rows = zip(*[column[j] for column in block])
+                if self.layout == "sheets":
+                    self.new_sheet(f"Ряд {name}", FORECAST_COLUMNS)
+                elif self.sheet_rows + horizon > self.MAX_ROWS:
+                    self.new_sheet(f"Прогноз {len(self.titles) + 1}", RESULT_COLUMNS)
+
+                self.params.append([name, a, a0, a1, a2, self.sheet.title, self.sheet_rows + 1])
+                for row in rows:
+                    self.sheet.append([name, a, *row] if self.layout == "long" else list(row))
+                self.sheet_rows += horizon
+                self.rows += horizon
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+def open_writer(path, delimiter=",", excel_layout="long"):
+    """Писатель по расширению файла: .parquet, .arrow/.feather/.ipc, .xlsx, .npz, иначе CSV"""
+    if path.endswith(".xlsx"):
+        return ExcelWriter(path, excel_layout)
+    if path.endswith(".parquet"):
+        return ArrowWriter(path, parquet=True)
+    if path.endswith((".arrow", ".feather", ".ipc")):
+        return ArrowWriter(path)
+    if path.endswith(".npz"):
+        return NpzWriter(path)
+    return CsvWriter(path, delimiter)
+
+
+def write_results(path, result, ids=None, chunk_rows=CHUNK_ROWS, excel_layout="long"):
+    """Запись готового результата в файл; формат определяется расширением"""
+    with open_writer(path, excel_layout=excel_layout) as writer:
+        writer.write_result(result, ids, chunk_rows)
+    return writer.rows
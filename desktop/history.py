@@ -0,0 +1,187 @@
+"""
+История расчетов в локальной базе SQLite (режим WAL).
+
+Запуск (runs) — параметры расчета и время; ряды запуска (series) — идентификатор,
+α и массивы результата в виде байтов float64 (y, коэффициенты тренда, данные
+прогноза (11, horizon)). Индексы по идентификатору ряда, α и времени позволяют
+найти запуск без чтения массивов, а открытие запуска — чтение готовых байтов
+вместо пересчета. Ряды панели записываются одной транзакцией (executemany).
+
+    history = RunHistory(HISTORY_PATH)
+    run_id = history.save(result, ids, intervals="формула")
+    rows = history.runs(series_id="RU-77", limit=100)
+    result, ids, run = history.load(run_id)
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from engine import FORECAST_FIELDS, ForecastResult
+
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".forecast_history.sqlite")
+
+# Запусков на одной странице панели «История»
+PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    n_series INTEGER NOT NULL,
+    n_obs INTEGER NOT NULL,
+    horizon INTEGER NOT NULL,
+    intervals TEXT NOT NULL,
+    alpha REAL NOT NULL,
+    first_series TEXT
+);
+CREATE TABLE IF NOT EXISTS series (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    series_id TEXT,
+    alpha REAL NOT NULL,
+    y BLOB NOT NULL,
+    coeffs BLOB NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+CREATE INDEX IF NOT EXISTS runs_created ON runs(created, id);
+CREATE INDEX IF NOT EXISTS series_series_id ON series(series_id);
+CREATE INDEX IF NOT EXISTS series_alpha ON series(alpha);
+"""
+
+# Столбцы запуска, возвращаемые runs() и load()
+RUN_FIELDS = ("id", "created", "n_series", "n_obs", "horizon", "intervals", "alpha", "first_series")
+
+# Допуск при поиске по α (значения хранятся как float)
+ALPHA_TOLERANCE = 1e-9
+
+
+class RunHistory:
+    """
+    Хранилище запусков. У каждого потока свое соединение: WAL позволяет
+    читать историю в главном потоке, пока рабочий поток записывает новый запуск.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    def connect(self):
+        """Соединение текущего потока (создается при первом обращении)"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def save(self, result, ids=None, intervals="формула"):
+        """
+        Запись результата: один ряд (ids=None) или панель с идентификаторами рядов.
+        Возвращает номер запуска.
+        """
+        panel = ids is not None
+        data = result.data if panel else result.data[:, None, :]
+        n_series, horizon = data.shape[1:]
+        y = np.atleast_2d(result.y).astype(np.float64, copy=False)
+        coeffs = np.atleast_2d(result.coeffs).astype(np.float64, copy=False)
+        alpha = np.broadcast_to(np.asarray(result.alpha, dtype=np.float64), (n_series,))
+        names = [str(name) for name in ids.tolist()] if panel else [None]
+
+        # Поля одного ряда подряд: строка blob — непрерывный участок массива
+        data = np.ascontiguousarray(data.transpose(1, 0, 2), dtype=np.float64)
+        y = np.ascontiguousarray(y)
+        coeffs = np.ascontiguousarray(coeffs)
+
+        rows = (
+            (position, names[position], float(alpha[position]),
+             y[position].tobytes(), coeffs[position].tobytes(), data[position].tobytes())
+            for position in range(n_series)
+        )
+        db = self.connect()
+        with db:
+            run_id = db.execute(
+                "INSERT INTO runs (created, n_series, n_obs, horizon, intervals, alpha, first_series) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), n_series, y.shape[1], horizon, intervals, float(alpha[0]), names[0])
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO series (run_id, position, series_id, alpha, y, coeffs, data) "
+                f"VALUES ({run_id}, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return run_id
+
+    def runs(self, series_id=None, alpha=None, since=None, before=None, limit=PAGE_SIZE):
+        """
+        Запуски от новых к старым без массивов: словари с полями RUN_FIELDS.
+        series_id и alpha — запуски, содержащие такой ряд / такое α; since — не
+        раньше метки времени; before — (created, id) последнего запуска
+        предыдущей страницы для постраничной загрузки.
+        """
+        where, params = [], []
+        if series_id is not None:
+            where.append("id IN (SELECT run_id FROM series WHERE series_id = ?)")
+            params.append(str(series_id))
+        if alpha is not None:
+            where.append("id IN (SELECT run_id FROM series WHERE alpha BETWEEN ? AND ?)")
+            params += [alpha - ALPHA_TOLERANCE, alpha + ALPHA_TOLERANCE]
+        if since is not None:
+            where.append("created >= ?")
+            params.append(since)
+        if before is not None:
+            where.append("(created, id) < (?, ?)")
+            params += list(before)
+
+        query = f"SELECT {', '.join(RUN_FIELDS)} FROM runs"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created DESC, id DESC LIMIT ?"
+        rows = self.connect().execute(query, params + [limit]).fetchall()
+        return [dict(zip(RUN_FIELDS, row)) for row in rows]
+
+    def load(self, run_id):
+        """
+        Запуск целиком: (ForecastResult, идентификаторы рядов или None, поля запуска).
+        Массивы собираются из байтов без пересчета.
+        """
+        db = self.connect()
+        row = db.execute(f"SELECT {', '.join(RUN_FIELDS)} FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Нет запуска {run_id} в истории")
+        run = dict(zip(RUN_FIELDS, row))
+
+        rows = db.execute(
+            "SELECT series_id, alpha, y, coeffs, data FROM series WHERE run_id = ? ORDER BY position",
+            (run_id,)
+        ).fetchall()
+        names, alpha, y, coeffs, data = zip(*rows)
+        n_series, horizon = len(rows), run["horizon"]
+
+        y = np.frombuffer(b"".join(y)).reshape(n_series, run["n_obs"])
+        coeffs = np.frombuffer(b"".join(coeffs)).reshape(n_series, 3)
+        data = np.frombuffer(b"".join(data)).reshape(n_series, len(FORECAST_FIELDS), horizon)
+        data = np.ascontiguousarray(data.transpose(1, 0, 2))
+
+        if names[0] is None:
+            # Один ряд из поля ввода
+            return ForecastResult(data[:, 0], coeffs[0], y[0], np.float64(alpha[0])), None, run
+        return ForecastResult(data, coeffs, y, np.array(alpha)), np.array(names), run
+
+    def delete(self, run_id):
+        db = self.connect()
+        with db:
+            db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
@@ -0,0 +1,333 @@
+"""
+Импорт панелей рядов из CSV, Excel (.xlsx), Parquet и .npy с чтением блоками.
+
+Широкий формат: строка — ряд, выбранные столбцы — наблюдения по порядку.
+Длинный формат: строка — (ряд, период, значение); строки одного ряда идут подряд,
+внутри ряда они упорядочиваются по периоду.
+
+iter_panel выдает блоки (идентификаторы, массив (n, n_obs)), поэтому файл
+любого размера проходит через calculate_forecast_batch, не загружаясь целиком.
+CSV читается numpy, pyarrow и openpyxl загружаются только для своих форматов.
+"""
+import csv
+import sys
+from itertools import chain, islice
+
+import numpy as np
+
+# Строк файла в одном блоке чтения
+CHUNK_ROWS = 20000
+
+LAYOUTS = ("wide", "long")
+
+
+def _resolve_column(selector, names):
+    """Номер столбца по имени из заголовка или по номеру (с нуля)"""
+    if names is not None and str(selector) in names:
+        return names.index(str(selector))
+    try:
+        index = int(selector)
+    except (TypeError, ValueError):
+        raise ValueError(f"Нет столбца «{selector}»") from None
+    if names is not None and not 0 <= index < len(names):
+        raise ValueError(f"Номер столбца {index} вне диапазона 0–{len(names) - 1}")
+    return index
+
+
+def _to_float(column, name):
+    """Приведение столбца к float64 с понятной ошибкой для нечисловых значений"""
+    try:
+        return np.asarray(column).astype(np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f"Столбец «{name}» содержит нечисловые или пустые значения") from None
+
+
+# -------------------------- ЧТЕНИЕ ТАБЛИЦ --------------------------
+class TableReader:
+    """
+    Блочное чтение таблицы: names — имена столбцов (None, если заголовка нет),
+    n_columns — их число, chunks(usecols, numeric) — блоки в виде списков
+    столбцов в порядке usecols. Столбцы из numeric приводятся к float64,
+    остальные читаются как есть.
+    """
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.names = None
+        self.n_columns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunks(self, usecols, numeric):
+        raise NotImplementedError
+
+    def column_name(self, index):
+        return self.names[index] if self.names is not None else str(index)
+
+    def close(self):
+        pass
+
+
+class CsvReader(TableReader):
+    """CSV через np.loadtxt по блокам строк; '-' — стандартный ввод"""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, delimiter=",", header=False):
+        super().__init__(path, chunk_rows)
+        self.delimiter = delimiter
+        self.stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+        self.lines = self.stream
+
+        # Первая строка разбирается по правилам CSV: разделитель внутри кавычек — часть поля
+        first = self.stream.readline()
+        fields = next(csv.reader([first], delimiter=delimiter, quotechar='"'), [])
+        self.n_columns = len(fields) if first.strip() else 0
+        if header:
+            self.names = [name.strip() for name in fields]
+        else:
+            # Первая строка уже данные: она возвращается в начало потока
+            self.lines = chain([first], self.stream)
+
+    def chunks(self, usecols, numeric):
+        # Все столбцы числовые — разбор сразу в float, иначе строки с приведением по столбцам
+        all_numeric = len(numeric) == len(usecols)
+        while True:
+            lines = [line for line in islice(self.lines, self.chunk_rows) if line.strip()]
+            if not lines:
+                return
+            try:
+                block = np.loadtxt(lines, delimiter=self.delimiter, usecols=usecols, quotechar='"',
+                                   dtype=np.float64 if all_numeric else str, ndmin=2)
+            except ValueError as e:
+                raise ValueError(f"Ошибка разбора CSV: {e}") from None
+            columns = list(block.T)
+            if not all_numeric:
+                for k, index in enumerate(usecols):
+                    if index in numeric:
+                        columns[k] = _to_float(columns[k], self.column_name(index))
+            yield columns
+
+    def close(self):
+        if self.stream is not sys.stdin:
+            self.stream.close()
+
+
+class ExcelReader(TableReader):
+    """Лист .xlsx через openpyxl в режиме read_only: строки читаются по мере разбора"""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, header=False, sheet=None):
+        from openpyxl import load_workbook
+
+        super().__init__(path, chunk_rows)
+        self.workbook = load_workbook(path, read_only=True, data_only=True)
+        worksheet = self.workbook[sheet] if sheet is not None else self.workbook.worksheets[0]
+        self.rows = worksheet.iter_rows(values_only=True)
+
+        first = next(self.rows, ())
+        self.n_columns = len(first)
+        if header:
+            self.names = [str(name) for name in first]
+        else:
+            self.rows = chain([first], self.rows)
+
+    def chunks(self, usecols, numeric):
+        while True:
+            rows = [row for row in islice(self.rows, self.chunk_rows) if any(v is not None for v in row)]
+            if not rows:
+                return
+            columns = []
+            for index in usecols:
+                column = [row[index] if index < len(row) else None for row in rows]
+                if index in numeric:
+                    columns.append(_to_float(column, self.column_name(index)))
+                else:
+                    columns.append(np.array(column, dtype=object))
+            yield columns
+
+    def close(self):
+        self.workbook.close()
+
+
+class ParquetReader(TableReader):
+    """Parquet через pyarrow: читаются только нужные столбцы, пакетами по chunk_rows строк"""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        import pyarrow.parquet as pq
+
+        super().__init__(path, chunk_rows)
+        self.file = pq.ParquetFile(path)
+        self.names = list(self.file.schema_arrow.names)
+        self.n_columns = len(self.names)
+
+    def chunks(self, usecols, numeric):
+        import pyarrow as pa
+
+        names = [self.names[index] for index in usecols]
+        for batch in self.file.iter_batches(batch_size=self.chunk_rows, columns=names):
+            columns = []
+            for index, column in zip(usecols, batch.columns):
+                if index in numeric:
+                    try:
+                        column = column.cast(pa.float64())
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                        raise ValueError(f"Столбец «{self.names[index]}» содержит нечисловые значения") from None
+                    if column.null_count:
+                        raise ValueError(f"Столбец «{self.names[index]}» содержит пустые значения")
+                columns.append(column.to_numpy(zero_copy_only=False))
+            yield columns
+
+    def close(self):
+        self.file.close()
+
+
+class NpyReader(TableReader):
+    """Массив .npy (строка — ряд) с отображением в память: блок — срез строк"""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        super().__init__(path, chunk_rows)
+        self.array = np.load(path, mmap_mode="r")
+        if self.array.ndim == 1:
+            self.array = self.array[None, :]
+        self.n_columns = self.array.shape[1]
+
+    def chunks(self, usecols, numeric):
+        for lo in range(0, len(self.array), self.chunk_rows):
+            block = np.asarray(self.array[lo:lo + self.chunk_rows], dtype=np.float64)
+            yield list(block[:, usecols].T)
+
+
+def open_reader(path, delimiter=",", header=False, sheet=None, chunk_rows=CHUNK_ROWS):
+    """Читатель по расширению файла: .xlsx/.xlsm, .parquet/.pq, .npy, иначе CSV"""
+    lower = path.lower()
+    if lower.endswith((".xlsx", ".xlsm")):
+        return ExcelReader(path, chunk_rows, header, sheet)
+    if lower.endswith((".parquet", ".pq")):
+        return ParquetReader(path, chunk_rows)
+    if lower.endswith(".npy"):
+        return NpyReader(path, chunk_rows)
+    return CsvReader(path, chunk_rows, delimiter, header)
+
+
+# -------------------------- ПАНЕЛИ --------------------------
+def _wide_blocks(reader, columns, id_column):
+    """
+    Широкий формат: строка — ряд. id_column="auto" — первый столбец считается
+    идентификатором, если в первом блоке его значения не числа.
+    """
+    detect = id_column == "auto"
+    if detect:
+        id_index = 0
+    else:
+        id_index = None if id_column is None else _resolve_column(id_column, reader.names)
+    if columns is None:
+        values = [k for k in range(reader.n_columns) if k != id_index]
+    else:
+        values = [_resolve_column(column, reader.names) for column in columns]
+    if not values:
+        raise ValueError("Не выбраны столбцы значений")
+
+    usecols = values if id_index is None else [id_index] + values
+    offset = 0
+    for block in reader.chunks(usecols, set(values)):
+        if detect:
+            detect = False
+            try:
+                _to_float(block[0], reader.column_name(0))
+            except ValueError:
+                pass
+            else:
+                id_index = None
+        if id_index is None and len(block) > len(values):
+            # Первый столбец оказался значениями
+            block[0] = _to_float(block[0], reader.column_name(0))
+
+        n = len(block[0])
+        ids = np.arange(offset, offset + n) if id_index is None else block.pop(0)
+        offset += n
+        yield ids, np.column_stack(block)
+
+
+def _long_blocks(reader, id_column, period_column, value_column):
+    """
+    Длинный формат: строки одного ряда подряд. Последний ряд блока может
+    продолжиться в следующем, поэтому он переносится и выдается позже.
+    """
+    usecols = [_resolve_column(c, reader.names) for c in (id_column, period_column, value_column)]
+    n_obs = None
+    carry = None
+
+    def complete(ids, periods, values, bounds):
+        """Готовые ряды: (идентификаторы, массив значений по возрастанию периода)"""
+        nonlocal n_obs
+        lengths = np.diff(bounds)
+        if n_obs is None:
+            n_obs = int(lengths[0])
+        bad = np.flatnonzero(lengths != n_obs)
+        if len(bad):
+            raise ValueError(f"У ряда {ids[bounds[bad[0]]]} {lengths[bad[0]]} наблюдений, "
+                             f"у первого ряда — {n_obs}")
+        k = len(lengths)
+        periods = periods[:bounds[-1]].reshape(k, n_obs)
+        if periods.dtype.kind in "UO":
+            # Периоды-числа из текста сортируются как числа («9» раньше «10»)
+            try:
+                periods = periods.astype(np.float64)
+            except (TypeError, ValueError):
+                pass
+        order = np.argsort(periods, axis=1, kind="stable")
+        block = np.take_along_axis(values[:bounds[-1]].reshape(k, n_obs), order, axis=1)
+        return ids[bounds[:-1]], block
+
+    for ids, periods, values in reader.chunks(usecols, {usecols[2]}):
+        if carry is not None:
+            ids, periods, values = (np.concatenate([a, b]) for a, b in zip(carry, (ids, periods, values)))
+
+        # Начала рядов — строки, где меняется идентификатор
+        starts = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+        bounds = np.concatenate([[0], starts])
+        carry = ids[bounds[-1]:], periods[bounds[-1]:], values[bounds[-1]:]
+        if len(bounds) > 1:
+            yield complete(ids, periods, values, bounds)
+
+    if carry is not None and len(carry[0]):
+        ids, periods, values = carry
+        yield complete(ids, periods, values, np.array([0, len(ids)]))
+
+
+def iter_panel(path, layout="wide", columns=None, id_column=None, period_column=1, value_column=2,
+               header=False, delimiter=",", sheet=None, chunk_rows=CHUNK_ROWS):
+    """
+    Панель рядов из файла блоками (идентификаторы, массив (n, n_obs) float64).
+
+    layout="wide" — столбцы columns (имена или номера; по умолчанию все, кроме
+    id_column) — наблюдения ряда; без id_column рядам присваиваются номера по порядку,
+    id_column="auto" — определить по первому столбцу.
+    layout="long" — столбцы id_column (по умолчанию первый), period_column, value_column.
+    header — первая строка CSV/Excel содержит имена столбцов (по умолчанию нет, как в CLI).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Неизвестный формат панели: {layout}")
+
+    with open_reader(path, delimiter, header, sheet, chunk_rows) as reader:
+        if layout == "wide":
+            yield from _wide_blocks(reader, columns, id_column)
+        else:
+            if isinstance(reader, NpyReader):
+                raise ValueError("Файл .npy поддерживается только в широком формате")
+            yield from _long_blocks(reader, 0 if id_column is None else id_column,
+                                    period_column, value_column)
+
+
+def read_panel(path, **kwargs):
+    """Панель целиком: (идентификаторы, массив (n_series, n_obs)). Аргументы — как у iter_panel"""
+    ids, blocks = [], []
+    for block_ids, block in iter_panel(path, **kwargs):
+        ids.append(block_ids)
+        blocks.append(block)
+    if not blocks:
+        raise ValueError("Файл не содержит рядов")
+    return np.concatenate(ids), np.concatenate(blocks)
@@ -1,111 +1,76 @@
+import time
+
+START_TIME = time.perf_counter()
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, font
 import numpy as np
-import pandas as pd
-from math import sqrt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
 from datetime import datetime
 
-# Настройка стиля matplotlib
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from cache import ForecastCache
+from engine import (BACKTEST_COLUMNS, FORECAST_COLUMNS, backtest, calculate_forecast, optimize_alpha,
+                    with_bootstrap_intervals)
+from export import DISPLAY_DECIMALS, format_block, write_results
+from history import HISTORY_PATH, PAGE_SIZE, RunHistory
+from importer import iter_panel
+from table import VirtualTable
+from theme import Colors, apply_plot_style
+from timing import StageTimer, enable_json_log
+
+# Доверительные интервалы: формула по СКО тренда или бутстреп остатков заданного уровня
+INTERVAL_MODES = {"формула": None, "бутстреп 80%": 0.80, "бутстреп 90%": 0.90, "бутстреп 95%": 0.95}
+BOOTSTRAP_REPLICATES = 2000
+
+# Объем массивов в кэше расчетов: импортированные панели занимают (11, рядов, горизонт)
+FORECAST_CACHE_BYTES = 256 * 2 ** 20
+
+# matplotlib и seaborn загружаются отложенно (см. load_plotting)
+_plotting = None
+_plotting_lock = threading.Lock()
 
 
-# -------------------------- ЛОГИКА РАСЧЁТА --------------------------
-def calculate_forecast(values, alpha):
+# -------------------------- ОТЛОЖЕННАЯ ЗАГРУЗКА ГРАФИКИ --------------------------
+def load_plotting():
     """
-    Прогнозирование методом экспоненциального сглаживания квадратичного тренда
+    Импорт matplotlib и seaborn с настройкой стиля при первом обращении.
+    Возвращает (Figure, FigureCanvasTkAgg); можно вызывать из фонового потока.
     """
-    y = np.array(values, dtype=float)
-    n_obs = len(y)
-    t = np.arange(1, n_obs + 1)
-
-    # 1. Квадратичный тренд (полином 2-й степени)
-    X = np.vstack([np.ones_like(t), t, t ** 2]).T
-    coeffs, *_ = np.linalg.lstsq(X, y, rcond=None)
-    a0, a1, a2 = coeffs
-
-    total_steps = 13
-    rows = []
-
-    # 2. Начальные S0 по формулам из документа
-    s01 = a0 - a1 * (1 - alpha) / alpha + a2 * (1 - alpha) * (2 - alpha) / (2 * alpha ** 2)
-    s02 = a0 - 2 * a1 * (1 - alpha) / alpha + a2 * (1 - alpha) * (3 - 2 * alpha) / (alpha ** 2)
-    s03 = a0 - 3 * a1 * (1 - alpha) / alpha + 3 * a2 * (1 - alpha) * (4 - 3 * alpha) / (2 * alpha ** 2)
-
-    # 3. Первые экспоненциальные средние
-    s1 = alpha * (a0 + a1 * 1 + a2 * 1 ** 2) + (1 - alpha) * s01
-    s2 = alpha * s1 + (1 - alpha) * s02
-    s3 = alpha * s2 + (1 - alpha) * s03
-
-    # 4. Расчет среднеквадратической ошибки
-    trend_obs = a0 + a1 * t + a2 * (t ** 2)
-    residuals = trend_obs - y
-    disp = np.sum((residuals - residuals.mean()) ** 2) / (len(residuals) - 1)
-    kvadr = sqrt(disp)
-
-    # 5. Прогноз на 13 периодов
-    for j in range(1, total_steps + 1):
-        # Коэффициенты для прогноза
-        a0_qua = 3 * (s1 - s2) + s3
-        remp = (6 - 5 * alpha) * s1 - 2 * (5 - 4 * alpha) * s2 + (4 - 3 * alpha) * s3
-        a1_qua = remp * alpha / (2 * (1 - alpha) ** 2)
-        a2_qua = (s1 - 2 * s2 + s3) * alpha ** 2 / ((1 - alpha) ** 2)
-
-        # Прогнозное значение
-        forecast = a0_qua + a1_qua * j + 0.5 * a2_qua * j ** 2
-
-        # Ошибка прогноза
-        err = kvadr * sqrt(2 * alpha + 3 * alpha ** 2 + 3 * (alpha ** 3) * (j ** 2))
-
-        # Доверительные интервалы
-        upper = forecast + err
-        lower = forecast - err
-
-        # Сохраняем все промежуточные результаты
-        rows.append([
-            2003 + j,  # Год
-            round(s1, 4), round(s2, 4), round(s3, 4),
-            round(a0_qua, 4), round(a1_qua, 4), round(a2_qua, 4),
-            round(forecast, 2), round(err, 2),
-            round(upper, 2), round(lower, 2)
-        ])
-
-        # Обновление начальных условий для следующей итерации
-        s01 = a0_qua - a1_qua * (1 - alpha) / alpha + a2_qua * (1 - alpha) * (2 - alpha) / (2 * alpha ** 2)
-        s02 = a0_qua - 2 * a1_qua * (1 - alpha) / alpha + a2_qua * (1 - alpha) * (3 - 2 * alpha) / (alpha ** 2)
-        s03 = a0_qua - 3 * a1_qua * (1 - alpha) / alpha + 3 * a2_qua * (1 - alpha) * (4 - 3 * alpha) / (2 * alpha ** 2)
-
-        s1 = alpha * (a0_qua + a1_qua * 1 + 0.5 * a2_qua * 1 ** 2) + (1 - alpha) * s01
-        s2 = alpha * s1 + (1 - alpha) * s02
-        s3 = alpha * s2 + (1 - alpha) * s03
-
-    # Создаем DataFrame с результатами
-    df = pd.DataFrame(rows, columns=[
-        "Год", "S1", "S2", "S3", "A0", "A1", "A2",
-        "Прогноз", "Ошибка", "Верхняя", "Нижняя"
-    ])
-
-    return df, (a0, a1, a2), y
-
-
-# -------------------------- СТИЛИ И ЦВЕТА --------------------------
-class Colors:
-    """Цветовая схема приложения"""
-    PRIMARY = "#2C3E50"  # Темно-синий
-    SECONDARY = "#34495E"  # Светло-синий
-    ACCENT = "#3498DB"  # Голубой
-    SUCCESS = "#2ECC71"  # Зеленый
-    WARNING = "#F39C12"  # Оранжевый
-    DANGER = "#E74C3C"  # Красный
-    LIGHT = "#ECF0F1"  # Светло-серый
-    DARK = "#2C3E50"  # Темный
-    WHITE = "#FFFFFF"  # Белый
-    GRAY = "#95A5A6"  # Серый
-
-    CHART_COLORS = ["#3498DB", "#2ECC71", "#E74C3C", "#9B59B6", "#F1C40F"]
+    global _plotting
+    with _plotting_lock:
+        if _plotting is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            import seaborn as sns
+
+            # Настройка стиля matplotlib
+            apply_plot_style()
+            sns.set_palette("husl")
+
+            _plotting = Figure, FigureCanvasTkAgg
+        return _plotting
+
+
+def warm_up_plotting():
+    """
+    Фоновый прогрев после появления окна: графический стек,
+    кэш шрифтов и глифов (через отрисовку вне экрана)
+    """
+    Figure, _ = load_plotting()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot()
+    ax.plot([2004, 2016], [0, 1], 'o-', label='Прогноз')
+    ax.set_title("Прогрев", fontsize=14, fontweight='bold')
+    ax.set_xlabel('Год', fontsize=11, fontweight='bold')
+    ax.legend(loc='best', fontsize=10, shadow=True)
+    fig.tight_layout()
+    FigureCanvasAgg(fig).draw()
 
 
 # -------------------------- КАСТОМНЫЕ ВИДЖЕТЫ --------------------------
@@ -209,7 +174,7 @@ class ModernText(tk.Text):
 
 # -------------------------- ГЛАВНОЕ ПРИЛОЖЕНИЕ --------------------------
 class ForecastApp:
-    def __init__(self, root):
+    def __init__(self, root, history_path=HISTORY_PATH):
         self.root = root
         self.root.title("📈 Прогнозирование - Метод экспоненциального сглаживания")
         self.root.geometry("1400x800")
@@ -227,9 +192,48 @@ class ForecastApp:
         self.setup_styles()
 
         # Данные
-        self.df = None
+        self.result = None
+        self.result_ids = None  # идентификаторы рядов панельного результата
+        self.shown_series = 0   # ряд панельного результата на графике
+        self.result_intervals = "формула"
+        self.panel = None       # импортированная панель (n_series, n_obs)
+        self.panel_ids = None
+        self.panel_index = {}   # идентификатор ряда -> номер строки панели
         self.y = None
         self.trend_coeffs = None
+        self.cache = ForecastCache(max_bytes=FORECAST_CACHE_BYTES)
+
+        # История расчетов (SQLite): без базы приложение работает, но не сохраняет запуски
+        try:
+            self.history = RunHistory(history_path)
+            self.history_error = None
+        except sqlite3.Error as e:
+            self.history, self.history_error = None, str(e)
+        self.history_filter = {}
+        self.history_last = None    # (created, id) последнего загруженного запуска
+        self.history_more = False   # есть ли еще страницы
+        self.history_stale = True   # список перечитывается при открытии вкладки
+
+        # Замеры этапов последних операций (см. finish_timing)
+        self.timers = {}
+        self.stats_body = ""
+        self.backtest_text = ""
+
+        # График создается после фонового прогрева matplotlib
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        self.chart = None
+        self.chart_toolbar = None
+        self.warm_up_thread = None
+        self.startup_times = {}
+
+        # Расчет в рабочем потоке: сообщения приходят через очередь
+        self.calc_queue = queue.Queue()
+        self.calc_job = 0
+        self.calc_thread = None
+        self.calc_cancel = None
+        self.calc_poll_id = None
 
         # Создание интерфейса
         self.create_widgets()
@@ -237,6 +241,67 @@ class ForecastApp:
         # Загрузить пример данных
         self.load_example_data()
 
+        # Прогрев графики начинается после первой отрисовки окна
+        self.root.after_idle(self.start_warm_up)
+
+    def start_warm_up(self):
+        """Запуск фонового прогрева графики после появления окна"""
+        self.startup_times["Окно показано"] = time.perf_counter()
+
+        self.warm_up_thread = threading.Thread(target=warm_up_plotting, daemon=True)
+        self.warm_up_thread.start()
+        self.root.after(50, self.poll_warm_up)
+
+    def poll_warm_up(self):
+        """Ожидание завершения прогрева без блокировки интерфейса"""
+        if self.warm_up_thread.is_alive():
+            self.root.after(50, self.poll_warm_up)
+            return
+
+        self.startup_times["Графика прогрета"] = time.perf_counter()
+
+        # Первая отрисовка холста, пока пользователь еще не запустил расчет
+        if self.canvas is None:
+            self.ensure_chart()
+            self.draw_chart_placeholder()
+        self.startup_times["График готов"] = time.perf_counter()
+
+    def ensure_chart(self):
+        """Создание фигуры и холста при первом обращении"""
+        if self.canvas is not None:
+            return
+
+        # Если прогрев ещё идет, дожидаемся его, а не импортируем параллельно
+        if self.warm_up_thread is not None:
+            self.warm_up_thread.join()
+        Figure, FigureCanvasTkAgg = load_plotting()
+
+        from chart import ForecastChart
+
+        # Создаем фигуру matplotlib
+        self.fig = Figure(figsize=(10, 6), dpi=100)
+        self.ax = self.fig.add_subplot()
+        self.fig.patch.set_facecolor(Colors.WHITE)
+        self.ax.set_facecolor(Colors.WHITE)
+
+        # Создаем холст на месте заглушки
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_container)
+        self.chart_placeholder.destroy()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, before=self.chart_controls)
+
+        # Линии и подписи создаются один раз, дальше меняются только их данные
+        self.chart = ForecastChart(self.fig, self.ax, self.canvas, Colors)
+
+        # Лупа и сдвиг: при изменении диапазона график прореживается заново
+        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+        self.chart_toolbar = NavigationToolbar2Tk(self.canvas, self.chart_controls, pack_toolbar=False)
+        self.chart_toolbar.config(bg=Colors.WHITE)
+        self.chart_toolbar.pack(side=tk.RIGHT)
+
+    def draw_chart_placeholder(self):
+        """Пустой график до выполнения расчета"""
+        self.chart.clear("График появится после расчета")
+
     def center_window(self):
         """Центрирование окна на экране"""
         self.root.update_idletasks()
@@ -366,7 +431,7 @@ class ForecastApp:
         # Поле ввода значений
         tk.Label(
             content_frame,
-            text="Введите 10 значений (через запятую):",
+            text="Введите значения (через запятую, не меньше 3):",
             font=("Segoe UI", 10, "bold"),
             bg=Colors.WHITE,
             fg=Colors.PRIMARY
@@ -402,16 +467,53 @@ class ForecastApp:
             fg=Colors.GRAY
         ).pack(side=tk.LEFT, padx=(10, 0))
 
+        # Поле горизонта прогноза
+        tk.Label(
+            content_frame,
+            text="Горизонт прогноза (периодов):",
+            font=("Segoe UI", 10, "bold"),
+            bg=Colors.WHITE,
+            fg=Colors.PRIMARY
+        ).pack(anchor="w", pady=(10, 5))
+
+        self.horizon_entry = ModernEntry(content_frame, width=20)
+        self.horizon_entry.pack(anchor="w")
+        self.horizon_entry.insert(0, "13")
+
+        # Способ расчета доверительных интервалов
+        tk.Label(
+            content_frame,
+            text="Доверительный интервал:",
+            font=("Segoe UI", 10, "bold"),
+            bg=Colors.WHITE,
+            fg=Colors.PRIMARY
+        ).pack(anchor="w", pady=(10, 5))
+
+        self.interval_mode = ttk.Combobox(
+            content_frame, values=list(INTERVAL_MODES), state="readonly", width=18
+        )
+        self.interval_mode.set("формула")
+        self.interval_mode.pack(anchor="w")
+
         # Кнопки
         button_frame = tk.Frame(content_frame, bg=Colors.WHITE)
         button_frame.pack(fill=tk.X, pady=15)
 
-        ModernButton(
+        self.calculate_button = ModernButton(
             button_frame,
             text="🚀 Рассчитать",
             bg_color=Colors.SUCCESS,
             hover_color="#27AE60",
             command=self.calculate
+        )
+        self.calculate_button.pack(side=tk.LEFT, padx=(0, 10))
+
+        ModernButton(
+            button_frame,
+            text="🎯 Авто α",
+            bg_color=Colors.ACCENT,
+            hover_color="#2980B9",
+            command=self.auto_alpha
         ).pack(side=tk.LEFT, padx=(0, 10))
 
         ModernButton(
@@ -422,6 +524,93 @@ class ForecastApp:
             command=self.clear_data
         ).pack(side=tk.LEFT)
 
+        # Индикатор выполнения (показывается только во время расчета)
+        self.progress_frame = tk.Frame(content_frame, bg=Colors.WHITE)
+
+        self.progress_label = tk.Label(
+            self.progress_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=Colors.WHITE,
+            fg=Colors.GRAY
+        )
+        self.progress_label.pack(anchor="w", pady=(0, 5))
+
+        self.progress = ttk.Progressbar(self.progress_frame, mode="determinate", maximum=100)
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        ModernButton(
+            self.progress_frame,
+            text="⛔ Отмена",
+            bg_color=Colors.DANGER,
+            hover_color="#C0392B",
+            command=self.cancel_calculation,
+            font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        # Импорт панели рядов из файла
+        import_frame = tk.Frame(content_frame, bg=Colors.WHITE)
+        import_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ModernButton(
+            import_frame,
+            text="📂 Импорт",
+            bg_color=Colors.SECONDARY,
+            hover_color=Colors.PRIMARY,
+            command=self.import_panel
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
+        self.import_layout = tk.StringVar(value="wide")
+        for text, value in (("строка — ряд", "wide"), ("ряд, период, значение", "long")):
+            ttk.Radiobutton(
+                import_frame,
+                text=text,
+                variable=self.import_layout,
+                value=value
+            ).pack(side=tk.LEFT, padx=(0, 5))
+
+        # Первая строка CSV/Excel — имена столбцов (как ключ --header пакетного режима)
+        self.import_header = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            import_frame,
+            text="заголовок",
+            variable=self.import_header
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
+        # Выбор ряда импортированной панели (показывается после импорта)
+        self.panel_frame = tk.Frame(content_frame, bg=Colors.WHITE)
+
+        self.panel_label = tk.Label(
+            self.panel_frame,
+            text="",
+            font=("Segoe UI", 9),
+            bg=Colors.WHITE,
+            fg=Colors.GRAY
+        )
+        self.panel_label.pack(anchor="w", pady=(0, 5))
+
+        tk.Label(
+            self.panel_frame,
+            text="Ряд:",
+            font=("Segoe UI", 10, "bold"),
+            bg=Colors.WHITE,
+            fg=Colors.PRIMARY
+        ).pack(side=tk.LEFT)
+
+        self.series_combo = ttk.Combobox(self.panel_frame, width=18)
+        self.series_combo.pack(side=tk.LEFT, padx=5)
+        self.series_combo.bind("<<ComboboxSelected>>", lambda e: self.select_series())
+        self.series_combo.bind("<Return>", lambda e: self.select_series())
+
+        ModernButton(
+            self.panel_frame,
+            text="📊 Рассчитать все",
+            bg_color=Colors.SUCCESS,
+            hover_color="#27AE60",
+            command=self.calculate_panel,
+            font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
         # -------------------- Примеры --------------------
         examples_card = CardFrame(scroll_frame, title="ПРИМЕРЫ ДАННЫХ", bg=Colors.WHITE, width=400)
         examples_card.pack(fill=tk.X, pady=(0, 15))
@@ -480,15 +669,18 @@ class ForecastApp:
     • α = 2/(m+1)
     • Рекомендуемые значения: 0.01 - 0.3
     • По умолчанию: α = 0.0625
+    • «Авто α» подбирает α по сетке значений
 
     Входные данные:
-    • 10 значений
+    • Не меньше 3 значений
     • Дробные числа
+    • Импорт панели рядов: CSV, Excel, Parquet
 
     Выходные данные:
-    • Прогноз на 13 периодов
+    • Прогноз на заданный горизонт (13 периодов)
     • Доверительные интервалы
     • Визуализация графиков
+    • История расчетов: открытие без пересчета
     """
 
         tk.Label(
@@ -525,17 +717,50 @@ class ForecastApp:
 
         self.create_stats_widget()
 
+        # Вкладка 4: История расчетов
+        self.history_frame = CardFrame(self.notebook, bg=Colors.WHITE)
+        self.notebook.add(self.history_frame, text="🕘 ИСТОРИЯ")
+
+        self.create_history_widget()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
         # Панель с кнопками экспорта
         self.create_export_panel(parent)
 
     def create_table_widget(self):
         """Создание виджета таблицы"""
-        # Контейнер для таблицы
-        table_container = tk.Frame(self.table_frame, bg=Colors.WHITE)
-        table_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Панель перехода к ряду
+        table_controls = tk.Frame(self.table_frame, bg=Colors.WHITE)
+        table_controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        tk.Label(
+            table_controls,
+            text="Ряд:",
+            font=("Segoe UI", 10),
+            bg=Colors.WHITE,
+            fg=Colors.DARK
+        ).pack(side=tk.LEFT)
+
+        self.series_entry = ModernEntry(table_controls, width=10)
+        self.series_entry.pack(side=tk.LEFT, padx=5)
+        self.series_entry.insert(0, "0")
+        self.series_entry.bind("<Return>", lambda e: self.jump_to_series())
+
+        ModernButton(
+            table_controls,
+            text="➡ Перейти",
+            command=self.jump_to_series,
+            bg_color=Colors.SECONDARY,
+            hover_color=Colors.PRIMARY
+        ).pack(side=tk.LEFT)
 
-        # Создаем Treeview с красивым стилем
-        columns = ("Год", "S1", "S2", "S3", "A0", "A1", "A2", "Прогноз", "Ошибка", "Верхняя", "Нижняя")
+        tk.Label(
+            table_controls,
+            text="Сортировка — щелчок по заголовку столбца",
+            font=("Segoe UI", 9),
+            bg=Colors.WHITE,
+            fg=Colors.GRAY
+        ).pack(side=tk.RIGHT)
 
         # Стили для Treeview
         style = ttk.Style()
@@ -561,57 +786,30 @@ class ForecastApp:
             background=[('active', Colors.SECONDARY)]
         )
 
-        # Создаем Treeview
-        self.tree = ttk.Treeview(
-            table_container,
-            columns=columns,
-            show="headings",
-            style="Custom.Treeview",
-            height=15
-        )
-
-        # Настраиваем колонки
-        column_widths = [60, 80, 80, 80, 80, 80, 80, 80, 80, 80, 80]
-        for col, width in zip(columns, column_widths):
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=width, anchor="center", minwidth=50)
-
-        # Добавляем прокрутку
-        scrollbar_y = ttk.Scrollbar(table_container, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar_x = ttk.Scrollbar(table_container, orient=tk.HORIZONTAL, command=self.tree.xview)
-
-        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
-
-        # Размещаем виджеты
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        scrollbar_y.grid(row=0, column=1, sticky="ns")
-        scrollbar_x.grid(row=1, column=0, sticky="ew")
-
-        # Настраиваем расширение
-        table_container.grid_rowconfigure(0, weight=1)
-        table_container.grid_columnconfigure(0, weight=1)
+        # Виртуальная таблица: в Treeview только видимые строки
+        self.table = VirtualTable(self.table_frame, style="Custom.Treeview", bg=Colors.WHITE)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def create_chart_widget(self):
         """Создание виджета графика"""
         # Контейнер для графика
-        chart_container = tk.Frame(self.chart_frame, bg=Colors.WHITE)
-        chart_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-        # Создаем фигуру matplotlib
-        self.fig, self.ax = plt.subplots(figsize=(10, 6), dpi=100)
-        self.fig.patch.set_facecolor(Colors.WHITE)
-        self.ax.set_facecolor(Colors.WHITE)
-
-        # Настройка стиля графика
-        self.ax.grid(True, alpha=0.3, linestyle='--')
-
-        # Создаем холст
-        self.canvas = FigureCanvasTkAgg(self.fig, master=chart_container)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart_container = tk.Frame(self.chart_frame, bg=Colors.WHITE)
+        self.chart_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Заглушка до создания фигуры (см. ensure_chart)
+        self.chart_placeholder = tk.Label(
+            self.chart_container,
+            text="Загрузка графического модуля...",
+            font=("Segoe UI", 11),
+            bg=Colors.WHITE,
+            fg=Colors.GRAY
+        )
+        self.chart_placeholder.pack(fill=tk.BOTH, expand=True)
 
         # Панель управления графиком
-        control_frame = tk.Frame(chart_container, bg=Colors.WHITE)
+        control_frame = tk.Frame(self.chart_container, bg=Colors.WHITE)
         control_frame.pack(fill=tk.X, pady=(10, 0))
+        self.chart_controls = control_frame
 
         self.chart_type = tk.StringVar(value="all")
 
@@ -623,7 +821,7 @@ class ForecastApp:
             font=("Segoe UI", 9),
             bg=Colors.WHITE,
             activebackground=Colors.WHITE,
-            command=self.update_chart
+            command=self.change_chart_view
         ).pack(side=tk.LEFT, padx=5)
 
         tk.Radiobutton(
@@ -634,7 +832,7 @@ class ForecastApp:
             font=("Segoe UI", 9),
             bg=Colors.WHITE,
             activebackground=Colors.WHITE,
-            command=self.update_chart
+            command=self.change_chart_view
         ).pack(side=tk.LEFT, padx=5)
 
         tk.Radiobutton(
@@ -645,7 +843,7 @@ class ForecastApp:
             font=("Segoe UI", 9),
             bg=Colors.WHITE,
             activebackground=Colors.WHITE,
-            command=self.update_chart
+            command=self.change_chart_view
         ).pack(side=tk.LEFT, padx=5)
 
     def create_stats_widget(self):
@@ -654,6 +852,30 @@ class ForecastApp:
         stats_container = tk.Frame(self.stats_frame, bg=Colors.WHITE)
         stats_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        stats_controls = tk.Frame(stats_container, bg=Colors.WHITE)
+        stats_controls.pack(fill=tk.X, pady=(0, 5))
+
+        # Профилирование одного следующего расчета
+        self.profile_next = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            stats_controls,
+            text="🔬 Профилировать следующий расчет (cProfile)",
+            variable=self.profile_next,
+            font=("Segoe UI", 9),
+            bg=Colors.WHITE,
+            fg=Colors.DARK,
+            activebackground=Colors.WHITE
+        ).pack(side=tk.LEFT)
+
+        ModernButton(
+            stats_controls,
+            text="🧪 Проверка точности",
+            bg_color=Colors.SECONDARY,
+            hover_color=Colors.PRIMARY,
+            command=self.check_accuracy,
+            font=("Segoe UI", 9)
+        ).pack(side=tk.RIGHT)
+
         # Создаем текстовое поле с прокруткой
         text_frame = tk.Frame(stats_container, bg=Colors.WHITE)
         text_frame.pack(fill=tk.BOTH, expand=True)
@@ -679,6 +901,88 @@ class ForecastApp:
         self.stats_text.insert(1.0, "Здесь будет отображаться статистика после расчета...")
         self.stats_text.config(state=tk.DISABLED)
 
+    def create_history_widget(self):
+        """Создание вкладки истории: запуски подгружаются страницами при прокрутке"""
+        if self.history is None:
+            tk.Label(
+                self.history_frame,
+                text=f"История недоступна:\n{self.history_error}",
+                font=("Segoe UI", 10),
+                bg=Colors.WHITE,
+                fg=Colors.GRAY
+            ).pack(expand=True)
+            return
+
+        history_controls = tk.Frame(self.history_frame, bg=Colors.WHITE)
+        history_controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        # Поиск по идентификатору ряда и α
+        tk.Label(
+            history_controls,
+            text="Ряд:",
+            font=("Segoe UI", 10),
+            bg=Colors.WHITE,
+            fg=Colors.DARK
+        ).pack(side=tk.LEFT)
+
+        self.history_series = ModernEntry(history_controls, width=12)
+        self.history_series.pack(side=tk.LEFT, padx=(5, 10))
+        self.history_series.bind("<Return>", lambda e: self.refresh_history())
+
+        tk.Label(
+            history_controls,
+            text="α:",
+            font=("Segoe UI", 10),
+            bg=Colors.WHITE,
+            fg=Colors.DARK
+        ).pack(side=tk.LEFT)
+
+        self.history_alpha = ModernEntry(history_controls, width=8)
+        self.history_alpha.pack(side=tk.LEFT, padx=(5, 10))
+        self.history_alpha.bind("<Return>", lambda e: self.refresh_history())
+
+        ModernButton(
+            history_controls,
+            text="🔍 Найти",
+            command=self.refresh_history,
+            bg_color=Colors.SECONDARY,
+            hover_color=Colors.PRIMARY
+        ).pack(side=tk.LEFT)
+
+        ModernButton(
+            history_controls,
+            text="🗑 Удалить",
+            command=self.delete_history,
+            bg_color=Colors.DANGER,
+            hover_color="#C0392B"
+        ).pack(side=tk.RIGHT)
+
+        ModernButton(
+            history_controls,
+            text="📂 Открыть",
+            command=self.open_history,
+            bg_color=Colors.SUCCESS,
+            hover_color="#27AE60"
+        ).pack(side=tk.RIGHT, padx=(0, 10))
+
+        # Список запусков (без массивов результата)
+        list_frame = tk.Frame(self.history_frame, bg=Colors.WHITE)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        columns = ("Время", "Рядов", "Значений", "Горизонт", "α", "Интервалы", "Первый ряд")
+        self.history_tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+                                         style="Custom.Treeview", selectmode="browse")
+        for column in columns:
+            self.history_tree.heading(column, text=column)
+            self.history_tree.column(column, width=150 if column == "Время" else 90, anchor=tk.CENTER)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=lambda first, last: self.on_history_scroll(scrollbar, first, last))
+        self.history_tree.bind("<Double-1>", lambda e: self.open_history())
+
+        self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
     def create_export_panel(self, parent):
         """Создание панели экспорта"""
         export_frame = tk.Frame(parent, bg=Colors.LIGHT, height=60)
@@ -698,6 +1002,15 @@ class ForecastApp:
             font=("Segoe UI", 10)
         ).pack(side=tk.LEFT, padx=5)
 
+        ModernButton(
+            button_container,
+            text="📦 CSV / Parquet / Arrow",
+            bg_color="#2874A6",
+            hover_color="#21618C",
+            command=self.export_data,
+            font=("Segoe UI", 10)
+        ).pack(side=tk.LEFT, padx=5)
+
         ModernButton(
             button_container,
             text="🖼️ Сохранить график",
@@ -749,112 +1062,540 @@ class ForecastApp:
 
     def clear_data(self):
         """Очистка всех данных"""
+        if self.calc_thread is not None:
+            self.cancel_calculation()
+
         self.values_text.delete(1.0, tk.END)
         self.alpha_entry.delete(0, tk.END)
 
         # Очистка таблицы
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.table.set_result(None)
 
         # Очистка статистики
+        self.timers = {}
+        self.stats_body = ""
+        self.backtest_text = ""
         self.stats_text.config(state=tk.NORMAL)
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(1.0, "Здесь будет отображаться статистика после расчета...")
         self.stats_text.config(state=tk.DISABLED)
 
         # Очистка графика
-        self.ax.clear()
-        self.ax.set_title("График появится после расчета", fontsize=12, fontweight='bold')
-        self.ax.set_xlabel("Год")
-        self.ax.set_ylabel("Значение")
-        self.canvas.draw()
+        if self.canvas is not None:
+            self.draw_chart_placeholder()
 
-        self.df = None
+        self.result = None
+        self.result_ids = None
         self.y = None
         self.trend_coeffs = None
 
         messagebox.showinfo("Очистка", "Все данные успешно очищены!")
 
+    def read_values(self):
+        """Чтение исходных данных из поля ввода (None, если данные некорректны)"""
+        values_text = self.values_text.get(1.0, tk.END).strip()
+        if not values_text:
+            messagebox.showwarning("Внимание", "Введите исходные данные!")
+            return None
+
+        values = [float(x.strip()) for x in values_text.split(",")]
+
+        if len(values) < 3:
+            messagebox.showerror("Ошибка", f"Нужно не меньше 3 значений!\nВведено: {len(values)}")
+            return None
+
+        return values
+
+    def auto_alpha(self):
+        """Автоматический подбор параметра α"""
+        try:
+            values = self.read_values()
+            if values is None:
+                return
+
+            alpha = optimize_alpha(values)
+
+            self.alpha_entry.delete(0, tk.END)
+            self.alpha_entry.insert(0, f"{alpha:.4f}")
+
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", f"Проверьте правильность данных:\n{str(e)}")
+
+    def read_parameters(self):
+        """Чтение α, горизонта прогноза и способа интервалов (None, если данные некорректны)"""
+        # Получение параметра α
+        alpha_text = self.alpha_entry.get().strip()
+        if not alpha_text:
+            messagebox.showwarning("Ошибка", "Введите параметр α!")
+            return None
+
+        alpha = float(alpha_text)
+        if alpha <= 0 or alpha >= 1:
+            messagebox.showerror("Ошибка", "α должен быть в диапазоне: 0 < α < 1")
+            return None
+
+        # Получение горизонта прогноза
+        horizon = int(self.horizon_entry.get().strip())
+        if horizon < 1:
+            messagebox.showerror("Ошибка", "Горизонт прогноза должен быть не меньше 1")
+            return None
+
+        return alpha, horizon, self.interval_mode.get()
+
     def calculate(self):
         """Выполнение расчета прогноза"""
         try:
             # Получение входных данных
-            values_text = self.values_text.get(1.0, tk.END).strip()
-            if not values_text:
-                messagebox.showwarning("Внимание", "Введите исходные данные!")
+            values = self.read_values()
+            if values is None:
+                return
+
+            parameters = self.read_parameters()
+            if parameters is None:
+                return
+
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", f"Проверьте правильность данных:\n{str(e)}")
+            return
+
+        # Выполнение расчета в рабочем потоке
+        timer = self.new_timer(1, len(values), parameters[1])
+        self.start_job(self.run_calculation, values, *parameters, None, 0, timer)
+
+    def calculate_panel(self):
+        """Расчет прогноза сразу для всех рядов импортированной панели"""
+        if self.panel is None:
+            return
+
+        try:
+            parameters = self.read_parameters()
+            if parameters is None:
                 return
+            series = self.selected_series()
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", f"Проверьте правильность данных:\n{str(e)}")
+            return
+
+        timer = self.new_timer(*self.panel.shape, parameters[1])
+        self.start_job(self.run_calculation, self.panel, *parameters, self.panel_ids, series, timer)
+
+    def new_timer(self, n_series, n_obs, horizon):
+        """Замер этапов расчета; профилирование — если включено для следующего расчета"""
+        return StageTimer("forecast", profile=self.profile_next.get(),
+                          n_series=n_series, n_obs=n_obs, horizon=horizon)
+
+    def start_job(self, target, *args):
+        """
+        Запуск задачи в рабочем потоке: target(job, *args, cancel).
+        Сообщения задачи принимает poll_calculation. Выполняющаяся задача
+        отменяется: ее результаты не выводятся и не записываются в историю.
+        """
+        if self.calc_thread is not None:
+            self.cancel_calculation()
+
+        self.calc_job += 1
+        self.calc_cancel = threading.Event()
+        self.calc_thread = threading.Thread(
+            target=target,
+            args=(self.calc_job, *args, self.calc_cancel),
+            daemon=True
+        )
 
-            values = [float(x.strip()) for x in values_text.split(",")]
+        self.calculate_button.config(state=tk.DISABLED)
+        self.progress["value"] = 0
+        self.progress_label.config(text="Подготовка расчета...")
+        self.progress_frame.pack(fill=tk.X, pady=(0, 10))
 
-            if len(values) != 10:
-                messagebox.showerror("Ошибка", f"Нужно ровно 10 значений!\nВведено: {len(values)}")
+        self.calc_thread.start()
+        self.calc_poll_id = self.root.after(50, self.poll_calculation)
+
+    def run_calculation(self, job, values, alpha, horizon, intervals, ids, series, timer, cancel):
+        """
+        Рабочий поток: расчет и подготовка статистики.
+        values — один ряд или панель (n_series, n_obs), тогда статистика — по ряду series.
+        К виджетам не обращается, результаты передает через очередь.
+        """
+        try:
+            self.calc_queue.put((job, "progress", (10, "Расчет прогноза...")))
+            with timer.stage("Расчет прогноза"):
+                if np.ndim(values) == 2:
+                    result = self.cache.forecast_batch(values, alpha, horizon)
+                else:
+                    result, ids = calculate_forecast(values, alpha, horizon, cache=self.cache), None
+            if cancel.is_set():
                 return
 
-            # Получение параметра α
-            alpha_text = self.alpha_entry.get().strip()
-            if not alpha_text:
-                messagebox.showwarning("Ошибка", "Введите параметр α!")
+            # Эмпирические интервалы заменяют формульные (копия, кэш не меняется)
+            if INTERVAL_MODES[intervals] is not None:
+                self.calc_queue.put((job, "progress", (40, "Бутстреп интервалов...")))
+                with timer.stage("Бутстреп интервалов"):
+                    result = with_bootstrap_intervals(result, INTERVAL_MODES[intervals], BOOTSTRAP_REPLICATES)
+                if cancel.is_set():
+                    return
+
+            self.calc_queue.put((job, "progress", (60, "Подготовка статистики...")))
+            with timer.stage("Подготовка статистики"):
+                shown = result.series(series) if ids is not None else result
+                stats_text = self.statistics_text(shown, len(shown.y), alpha, intervals,
+                                                  n_series=len(values) if ids is not None else 1)
+            if cancel.is_set():
                 return
 
-            alpha = float(alpha_text)
-            if alpha <= 0 or alpha >= 1:
-                messagebox.showerror("Ошибка", "α должен быть в диапазоне: 0 < α < 1")
+            # Запись в историю: ряды панели — одной транзакцией
+            if self.history is not None:
+                self.calc_queue.put((job, "progress", (80, "Сохранение в историю...")))
+                with timer.stage("Сохранение в историю"):
+                    self.history.save(result, ids, intervals)
+
+            self.calc_queue.put((job, "done", (result, stats_text, ids, series, timer, intervals)))
+
+        except Exception as e:
+            self.calc_queue.put((job, "error", e))
+
+    def import_panel(self):
+        """Выбор файла и импорт панели рядов в рабочем потоке"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Данные", "*.csv *.txt *.xlsx *.xlsm *.parquet *.npy"),
+                ("CSV files", "*.csv"),
+                ("Excel files", "*.xlsx"),
+                ("Parquet files", "*.parquet"),
+                ("All files", "*.*")
+            ]
+        )
+        if file_path:
+            timer = StageTimer("import", path=os.path.basename(file_path))
+            self.start_job(self.run_import, file_path, self.import_layout.get(), self.import_header.get(), timer)
+
+    def run_import(self, job, path, layout, header, timer, cancel):
+        """Рабочий поток: чтение файла блоками с сообщениями о ходе чтения"""
+        try:
+            ids, blocks, n_series = [], [], 0
+            id_column = "auto" if layout == "wide" else None
+            with timer.stage("Чтение файла"):
+                for block_ids, block in iter_panel(path, layout=layout, id_column=id_column, header=header):
+                    if cancel.is_set():
+                        return
+                    ids.append(block_ids)
+                    blocks.append(block)
+                    n_series += len(block)
+                    self.calc_queue.put((job, "progress", (50, f"Прочитано рядов: {n_series}")))
+
+            if not blocks:
+                raise ValueError("Файл не содержит рядов")
+            with timer.stage("Объединение блоков"):
+                ids, panel = np.concatenate(ids), np.concatenate(blocks)
+            self.calc_queue.put((job, "imported", (ids, panel, path, timer)))
+
+        except Exception as e:
+            self.calc_queue.put((job, "error", e))
+
+    def poll_calculation(self):
+        """Прием сообщений рабочего потока; виджеты меняются только здесь"""
+        try:
+            while True:
+                job, kind, payload = self.calc_queue.get_nowait()
+                if job != self.calc_job:
+                    continue  # сообщение отмененного расчета
+
+                if kind == "progress":
+                    value, text = payload
+                    self.progress["value"] = value
+                    self.progress_label.config(text=text)
+                elif kind == "error":
+                    self.finish_calculation()
+                    if isinstance(payload, ValueError):
+                        messagebox.showerror("Ошибка ввода", f"Проверьте правильность данных:\n{str(payload)}")
+                    else:
+                        messagebox.showerror("Ошибка расчета", f"Ошибка при расчете:\n{str(payload)}")
+                    return
+                elif kind == "backtest":
+                    self.finish_calculation()
+                    self.backtest_text = payload
+                    self.show_statistics()
+                    self.notebook.select(self.stats_frame)
+                    return
+                elif kind == "imported":
+                    self.finish_calculation()
+                    self.apply_import(*payload)
+                    return
+                elif kind == "opened":
+                    self.finish_calculation()
+                    self.apply_history(*payload)
+                    return
+                else:
+                    self.finish_calculation()
+                    self.apply_results(*payload)
+                    return
+        except queue.Empty:
+            pass
+
+        self.calc_poll_id = self.root.after(50, self.poll_calculation)
+
+    def cancel_calculation(self):
+        """Отмена текущего расчета: его результаты будут проигнорированы"""
+        if self.calc_cancel is not None:
+            self.calc_cancel.set()
+        self.calc_job += 1
+        self.finish_calculation()
+
+    def finish_calculation(self):
+        """Скрытие индикатора и разблокировка кнопки расчета"""
+        if self.calc_poll_id is not None:
+            self.root.after_cancel(self.calc_poll_id)
+            self.calc_poll_id = None
+        self.calc_thread = None
+        self.calc_cancel = None
+        self.progress_frame.pack_forget()
+        self.calculate_button.config(state=tk.NORMAL)
+
+    def check_accuracy(self):
+        """Проверка точности текущего расчета на скользящей точке отсчета"""
+        if self.result is None:
+            messagebox.showwarning("Предупреждение", "Сначала выполните расчет!")
+            return
+        self.start_job(self.run_backtest, self.result.y, self.result.alpha)
+
+    def run_backtest(self, job, y, alpha, cancel):
+        """Рабочий поток: ошибки прогноза на шагах 1..3 от каждой точки отсчета"""
+        try:
+            self.calc_queue.put((job, "progress", (30, "Проверка точности...")))
+            result = backtest(y, alpha, steps=3)
+            if cancel.is_set():
                 return
 
-            # Выполнение расчета
-            self.df, self.trend_coeffs, self.y = calculate_forecast(values, alpha)
+            lines = [f"{BACKTEST_COLUMNS[0]:>4} {BACKTEST_COLUMNS[1]:>10} "
+                     + " ".join(f"{name:>10}" for name in BACKTEST_COLUMNS[2:])]
+            for step, count, mae, rmse, mape in result.summary().T.tolist():
+                lines.append(f"{step:4.0f} {count:10.0f} {mae:10.3f} {rmse:10.3f} {mape:10.2f}")
+            self.calc_queue.put((job, "backtest", "\n".join(lines)))
+
+        except Exception as e:
+            self.calc_queue.put((job, "error", e))
+
+    def apply_import(self, ids, panel, path, timer):
+        """Импортированная панель: выбор ряда и его значения в поле ввода"""
+        self.finish_timing(timer)
+        if panel.shape[1] < 3:
+            messagebox.showerror("Ошибка", f"Нужно не меньше 3 значений в ряду!\nВ файле: {panel.shape[1]}")
+            return
+
+        self.set_panel(ids, panel, os.path.basename(path))
+        self.select_series()
+
+    def set_panel(self, ids, panel, source):
+        """Панель рядов для расчета и список выбора ряда"""
+        self.panel, self.panel_ids = panel, ids
+        self.panel_index = {str(name): i for i, name in enumerate(ids.tolist())}
+
+        # В выпадающем списке только первые ряды, остальные выбираются вводом идентификатора
+        self.series_combo["values"] = [str(name) for name in ids[:1000].tolist()]
+        self.series_combo.set(str(ids[0]))
+        self.panel_label.config(
+            text=f"{source}: {len(panel)} рядов × {panel.shape[1]} значений"
+        )
+        self.panel_frame.pack(fill=tk.X, pady=(0, 10))
+
+    def selected_series(self):
+        """Номер ряда панели, выбранного в списке (по идентификатору или номеру)"""
+        text = self.series_combo.get().strip()
+        if text in self.panel_index:
+            return self.panel_index[text]
+
+        series = int(text)
+        if not 0 <= series < len(self.panel):
+            raise ValueError(f"Номер ряда должен быть от 0 до {len(self.panel) - 1}")
+        return series
+
+    def select_series(self):
+        """Выбор ряда панели: значения в поле ввода, график и статистика — если панель рассчитана"""
+        try:
+            series = self.selected_series()
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", f"Проверьте ряд:\n{str(e)}")
+            return
 
-            # Обновление таблицы
+        self.values_text.delete(1.0, tk.END)
+        self.values_text.insert(1.0, ", ".join(f"{v:g}" for v in self.panel[series].tolist()))
+
+        if self.result_ids is self.panel_ids and self.result is not None:
+            self.shown_series = series
+            shown = self.shown_result()
+            self.trend_coeffs, self.y = tuple(shown.coeffs), shown.y
+            self.update_statistics(self.statistics_text(shown, len(shown.y), shown.alpha, self.result_intervals,
+                                                        n_series=len(self.panel)))
+            self.update_chart()
+            self.table.show_series(series)
+
+    def shown_result(self):
+        """Результат одного ряда для графика: выбранный ряд панели или сам результат"""
+        if self.result_ids is not None:
+            return self.result.series(self.shown_series)
+        return self.result
+
+    def apply_results(self, result, stats_text, ids, series, timer, intervals, announce=True):
+        """Вывод готовых результатов в виджеты (главный поток)"""
+        self.result, self.result_ids, self.shown_series = result, ids, series
+        self.result_intervals = intervals
+        self.backtest_text = ""
+        self.history_stale = True
+        shown = self.shown_result()
+        self.trend_coeffs, self.y = tuple(shown.coeffs), shown.y
+
+        # Обновление таблицы
+        with timer.stage("Таблица"):
             self.update_table()
 
-            # Обновление статистики
-            self.update_statistics(values, alpha)
+        # Обновление статистики
+        with timer.stage("Статистика"):
+            self.update_statistics(stats_text)
 
-            # Построение графика
+        # Построение графика
+        with timer.stage("График"):
             self.update_chart()
 
-            # Переключение на вкладку с графиками
-            self.notebook.select(self.chart_frame)
+        # Переключение на вкладку с графиками
+        self.notebook.select(self.chart_frame)
+
+        # Этапы расчета — в панель статистики и журнал
+        self.finish_timing(timer)
 
+        if announce:
             messagebox.showinfo("Успешно", "✅ Расчет успешно завершен!")
 
+    # -------------------------- ИСТОРИЯ --------------------------
+    def on_tab_changed(self, event):
+        """Список истории читается при первом открытии вкладки и после новых расчетов"""
+        if self.history is not None and self.history_stale and \
+                self.notebook.select() == str(self.history_frame):
+            self.refresh_history()
+
+    def refresh_history(self):
+        """Список истории с первой страницы по условиям поиска"""
+        if self.history is None:
+            return
+
+        try:
+            alpha_text = self.history_alpha.get().strip()
+            self.history_filter = {
+                "series_id": self.history_series.get().strip() or None,
+                "alpha": float(alpha_text) if alpha_text else None,
+            }
         except ValueError as e:
-            messagebox.showerror("Ошибка ввода", f"Проверьте правильность данных:\n{str(e)}")
+            messagebox.showerror("Ошибка ввода", f"Проверьте α:\n{str(e)}")
+            return
+
+        self.history_tree.delete(*self.history_tree.get_children())
+        self.history_last = None
+        self.history_stale = False
+        self.load_history_page()
+
+    def load_history_page(self):
+        """Следующая страница запусков (от новых к старым) в конец списка"""
+        runs = self.history.runs(before=self.history_last, **self.history_filter)
+        self.history_more = len(runs) == PAGE_SIZE
+        if runs:
+            self.history_last = runs[-1]["created"], runs[-1]["id"]
+
+        for run in runs:
+            self.history_tree.insert("", tk.END, iid=str(run["id"]), values=(
+                datetime.fromtimestamp(run["created"]).strftime("%Y-%m-%d %H:%M:%S"),
+                run["n_series"], run["n_obs"], run["horizon"], f"{run['alpha']:.4f}",
+                run["intervals"], run["first_series"] if run["first_series"] is not None else "—"
+            ))
+
+    def on_history_scroll(self, scrollbar, first, last):
+        """Прокрутка списка: у конца подгружается следующая страница"""
+        scrollbar.set(first, last)
+        if self.history_more and float(last) >= 1.0:
+            self.load_history_page()
+
+    def selected_run(self):
+        """Номер запуска, выбранного в списке истории (None — с предупреждением)"""
+        selection = self.history_tree.selection() if self.history is not None else ()
+        if not selection:
+            messagebox.showwarning("Предупреждение", "Выберите запуск в списке истории!")
+            return None
+        return int(selection[0])
+
+    def open_history(self):
+        """Открытие запуска из истории в рабочем потоке (без пересчета)"""
+        run_id = self.selected_run()
+        if run_id is not None:
+            self.start_job(self.run_open_history, run_id, StageTimer("history", run=run_id))
+
+    def run_open_history(self, job, run_id, timer, cancel):
+        """Рабочий поток: чтение массивов запуска и подготовка статистики"""
+        try:
+            self.calc_queue.put((job, "progress", (30, "Чтение из истории...")))
+            with timer.stage("Чтение из истории"):
+                result, ids, run = self.history.load(run_id)
+            if cancel.is_set():
+                return
+
+            with timer.stage("Подготовка статистики"):
+                shown = result.series(0) if ids is not None else result
+                stats_text = self.statistics_text(shown, len(shown.y), shown.alpha, run["intervals"],
+                                                  n_series=run["n_series"],
+                                                  calculated=datetime.fromtimestamp(run["created"]))
+            if cancel.is_set():
+                return
+
+            self.calc_queue.put((job, "opened", (result, stats_text, ids, timer, run)))
+
         except Exception as e:
-            messagebox.showerror("Ошибка расчета", f"Ошибка при расчете:\n{str(e)}")
+            self.calc_queue.put((job, "error", e))
 
-    def update_table(self):
-        """Обновление таблицы с результатами"""
-        # Очистка таблицы
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def apply_history(self, result, stats_text, ids, timer, run):
+        """Запуск из истории: параметры в поля ввода, результаты — как после расчета"""
+        self.alpha_entry.delete(0, tk.END)
+        self.alpha_entry.insert(0, str(run["alpha"]))
+        self.horizon_entry.delete(0, tk.END)
+        self.horizon_entry.insert(0, str(run["horizon"]))
+        if run["intervals"] in INTERVAL_MODES:
+            self.interval_mode.set(run["intervals"])
+
+        if ids is not None:
+            self.set_panel(ids, result.y, f"История №{run['id']}")
+        first = result.y[0] if ids is not None else result.y
+        self.values_text.delete(1.0, tk.END)
+        self.values_text.insert(1.0, ", ".join(f"{v:g}" for v in first.tolist()))
 
-        if self.df is None:
+        self.apply_results(result, stats_text, ids, 0, timer, run["intervals"], announce=False)
+
+    def delete_history(self):
+        """Удаление выбранного запуска из истории"""
+        run_id = self.selected_run()
+        if run_id is None or not messagebox.askyesno("История", f"Удалить запуск №{run_id}?"):
             return
 
-        # Заполнение таблицы
-        for _, row in self.df.iterrows():
-            values = [
-                int(row["Год"]),
-                f"{row['S1']:.4f}",
-                f"{row['S2']:.4f}",
-                f"{row['S3']:.4f}",
-                f"{row['A0']:.4f}",
-                f"{row['A1']:.4f}",
-                f"{row['A2']:.4f}",
-                f"{row['Прогноз']:.2f}",
-                f"{row['Ошибка']:.2f}",
-                f"{row['Верхняя']:.2f}",
-                f"{row['Нижняя']:.2f}"
-            ]
-            self.tree.insert("", tk.END, values=values)
+        try:
+            self.history.delete(run_id)
+        except sqlite3.Error as e:
+            messagebox.showerror("Ошибка", f"Не удалось удалить запуск:\n{str(e)}")
+            return
+        self.history_tree.delete(str(run_id))
 
-    def update_statistics(self, values, alpha):
-        """Обновление статистической информации"""
-        if self.trend_coeffs is None:
+    def update_table(self):
+        """Обновление таблицы с результатами (строки форматируются при прокрутке)"""
+        self.table.set_result(self.result, self.result_ids)
+        if self.table.panel:
+            self.series_entry.delete(0, tk.END)
+            self.series_entry.insert(0, str(self.table.ids[0]))
+
+    def jump_to_series(self):
+        """Переход к первому шагу прогноза выбранного ряда"""
+        if self.result is None:
             return
 
-        a0, a1, a2 = self.trend_coeffs
+        try:
+            self.table.show_series(self.table.find_series(self.series_entry.get()))
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", f"Проверьте ряд:\n{str(e)}")
+
+    def statistics_text(self, result, n_values, alpha, intervals="формула", n_series=1, calculated=None):
+        """Текст статистической информации (без обращения к виджетам)"""
+        a0, a1, a2 = result.coeffs
 
         stats_text = f"""
 {'=' * 60}
@@ -871,130 +1612,85 @@ y = {a0:.4f} + {a1:.4f}·t + {a2:.4f}·t²
 ПАРАМЕТРЫ МОДЕЛИ
 {'=' * 60}
 Коэффициент сглаживания (α) = {alpha}
-Количество исходных данных = {len(values)}
-Период прогнозирования = 13 лет (2004-2016)
+Количество исходных данных = {n_values}
+Рядов в расчете = {n_series}
+Период прогнозирования = {result.horizon} пер. ({result.year[0]:.0f}-{result.year[-1]:.0f})
 
 {'=' * 60}
 СВОДНАЯ СТАТИСТИКА ПРОГНОЗА
 {'=' * 60}
-Минимальное значение: {self.df['Прогноз'].min():.2f}
-Максимальное значение: {self.df['Прогноз'].max():.2f}
-Среднее значение: {self.df['Прогноз'].mean():.2f}
-Стандартное отклонение: {self.df['Прогноз'].std():.2f}
+Минимальное значение: {result.forecast.min():.2f}
+Максимальное значение: {result.forecast.max():.2f}
+Среднее значение: {result.forecast.mean():.2f}
+Стандартное отклонение: {result.forecast.std(ddof=1):.2f}
+
+ДОВЕРИТЕЛЬНЫЕ ИНТЕРВАЛЫ ({intervals}):
+Средняя ширина: {result.error.mean():.2f}
+Диапазон ширины: [{result.error.min():.2f}, {result.error.max():.2f}]
 
-ДОВЕРИТЕЛЬНЫЕ ИНТЕРВАЛЫ:
-Средняя ширина: {self.df['Ошибка'].mean():.2f}
-Диапазон ширины: [{self.df['Ошибка'].min():.2f}, {self.df['Ошибка'].max():.2f}]
+Кэш расчетов: попаданий {self.cache.hits}, промахов {self.cache.misses}
 
 {'=' * 60}
-ВРЕМЯ РАСЧЕТА: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+ВРЕМЯ РАСЧЕТА: {(calculated or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')}
 {'=' * 60}
 """
+        return stats_text.strip()
+
+    def update_statistics(self, stats_text):
+        """Обновление статистической информации"""
+        self.stats_body = stats_text
+        self.show_statistics()
+
+    def show_statistics(self):
+        """Вывод статистики и замеров этапов последних операций"""
+        titles = {"forecast": "ЭТАПЫ РАСЧЕТА", "import": "ЭТАПЫ ИМПОРТА", "export": "ЭТАПЫ ЭКСПОРТА",
+                  "history": "ЭТАПЫ ОТКРЫТИЯ ИЗ ИСТОРИИ"}
+        sections = [self.stats_body] if self.stats_body else []
+        if self.backtest_text:
+            sections.append(f"{'=' * 60}\nТОЧНОСТЬ НА СКОЛЬЗЯЩЕЙ ТОЧКЕ ОТСЧЕТА\n{'=' * 60}\n{self.backtest_text}")
+        for operation, timer in self.timers.items():
+            section = f"{'=' * 60}\n{titles.get(operation, operation.upper())}\n{'=' * 60}\n{timer.text()}"
+            if timer.profile_path:
+                section += f"\nПрофиль cProfile: {timer.profile_path}"
+            sections.append(section)
 
         self.stats_text.config(state=tk.NORMAL)
         self.stats_text.delete(1.0, tk.END)
-        self.stats_text.insert(1.0, stats_text.strip())
+        self.stats_text.insert(1.0, "\n\n".join(sections))
         self.stats_text.config(state=tk.DISABLED)
 
+    def finish_timing(self, timer):
+        """Запись замера в журнал, сохранение профиля и вывод в панель статистики"""
+        timer.log()
+        if timer.profiles is not None:
+            # Профилирование включается на один расчет
+            timer.dump_profile(f"profile_{timer.started.strftime('%Y%m%d_%H%M%S')}.prof")
+            self.profile_next.set(False)
+
+        self.timers[timer.operation] = timer
+        self.show_statistics()
+
     def update_chart(self):
         """Обновление графика"""
-        if self.df is None or self.trend_coeffs is None:
+        if self.result is None or self.trend_coeffs is None:
             return
 
-        # Очистка предыдущего графика
-        self.ax.clear()
-
-        a0, a1, a2 = self.trend_coeffs
-
-        # Годы наблюдений (2004-2013)
-        years_obs = np.arange(2004, 2014)
+        self.ensure_chart()
 
-        # Годы прогноза (2004-2016)
-        years_all = self.df["Год"].values
+        # Новые данные для постоянных линий графика
+        self.chart.show(self.shown_result(), view=self.chart_type.get())
 
-        # Значения тренда для всех годов
-        t_all = np.arange(1, 14)  # t от 1 до 13
-        trend_all = a0 + a1 * t_all + a2 * (t_all ** 2)
+        # Кнопка «Домой» панели навигации возвращает к новому масштабу
+        self.chart_toolbar.update()
 
-        # Прогнозные значения
-        forecast_all = self.df["Прогноз"].values
-
-        # Выбор типа графика
-        chart_type = self.chart_type.get()
-
-        if chart_type == "all":
-            # Все данные
-            self.ax.plot(years_obs, self.y, 'o-', linewidth=2.5, markersize=8,
-                         label='Наблюдаемые данные', color=Colors.CHART_COLORS[0], alpha=0.9)
-
-            self.ax.plot(years_all, trend_all, 's--', linewidth=2, markersize=5,
-                         label='Квадратичный тренд', color=Colors.CHART_COLORS[1], alpha=0.8)
-
-            self.ax.plot(years_all, forecast_all, 'D-', linewidth=2.5, markersize=6,
-                         label='Прогноз (сглаживание)', color=Colors.CHART_COLORS[2], alpha=0.9)
-
-            # Доверительные интервалы
-            self.ax.fill_between(years_all,
-                                 self.df["Нижняя"].values,
-                                 self.df["Верхняя"].values,
-                                 alpha=0.15, color=Colors.CHART_COLORS[2],
-                                 label='Доверительный интервал')
-
-            title = "Сравнение наблюдаемых данных, тренда и прогноза"
-
-        elif chart_type == "forecast":
-            # Только прогноз
-            self.ax.plot(years_all, forecast_all, 'D-', linewidth=3, markersize=8,
-                         label='Прогноз (сглаживание)', color=Colors.CHART_COLORS[2])
-
-            # Доверительные интервалы
-            self.ax.fill_between(years_all,
-                                 self.df["Нижняя"].values,
-                                 self.df["Верхняя"].values,
-                                 alpha=0.2, color=Colors.CHART_COLORS[2],
-                                 label='Доверительный интервал')
-
-            title = "Прогнозные значения с доверительными интервалами"
-
-        else:  # "trend"
-            # Только тренд
-            self.ax.plot(years_obs, self.y, 'o-', linewidth=2, markersize=7,
-                         label='Наблюдаемые данные', color=Colors.CHART_COLORS[0], alpha=0.7)
-
-            self.ax.plot(years_all, trend_all, 's-', linewidth=2.5, markersize=6,
-                         label='Квадратичный тренд', color=Colors.CHART_COLORS[1])
-
-            title = "Наблюдаемые данные и квадратичный тренд"
-
-        # Настройка графика
-        self.ax.set_title(title, fontsize=14, fontweight='bold', pad=20, color=Colors.PRIMARY)
-        self.ax.set_xlabel('Год', fontsize=11, fontweight='bold', color=Colors.DARK)
-        self.ax.set_ylabel('Значение показателя', fontsize=11, fontweight='bold', color=Colors.DARK)
-
-        # Сетка
-        self.ax.grid(True, alpha=0.2, linestyle='-')
-
-        # Легенда
-        self.ax.legend(loc='best', fontsize=10, framealpha=0.9, shadow=True)
-
-        # Настройка делений на оси X
-        self.ax.set_xticks(years_all[::2])
-        self.ax.tick_params(axis='x', rotation=45)
-
-        # Настройка цвета осей
-        self.ax.spines['bottom'].set_color(Colors.GRAY)
-        self.ax.spines['left'].set_color(Colors.GRAY)
-
-        # Автоматическая настройка масштаба
-        self.ax.autoscale_view()
-
-        # Улучшенное расположение
-        self.fig.tight_layout()
-        self.canvas.draw()
+    def change_chart_view(self):
+        """Переключение вида графика без пересчета"""
+        if self.chart is not None:
+            self.chart.set_view(self.chart_type.get())
 
     def export_excel(self):
         """Экспорт результатов в Excel"""
-        if self.df is None:
+        if self.result is None:
             messagebox.showwarning("Предупреждение", "Нет данных для экспорта!")
             return
 
@@ -1006,27 +1702,48 @@ y = {a0:.4f} + {a1:.4f}·t + {a2:.4f}·t²
             )
 
             if file_path:
-                # Сохраняем основные результаты
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    self.df.to_excel(writer, sheet_name='Прогноз', index=False)
-
-                    # Добавляем лист с исходными данными
-                    if self.trend_coeffs is not None:
-                        a0, a1, a2 = self.trend_coeffs
-                        stats_df = pd.DataFrame({
-                            'Параметр': ['Коэффициент сглаживания (α)', 'A0', 'A1', 'A2'],
-                            'Значение': [self.alpha_entry.get(), a0, a1, a2]
-                        })
-                        stats_df.to_excel(writer, sheet_name='Параметры', index=False)
+                # Потоковая запись: лист прогноза и лист параметров (α, A0–A2)
+                timer = StageTimer("export", path=os.path.basename(file_path))
+                with timer.stage("Экспорт Excel"):
+                    write_results(file_path, self.result, self.result_ids)
+                self.finish_timing(timer)
 
                 messagebox.showinfo("Успешно", f"✅ Данные сохранены в файл:\n{file_path}")
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
 
+    def export_data(self):
+        """Потоковый экспорт результатов в CSV, Parquet или Arrow"""
+        if self.result is None:
+            messagebox.showwarning("Предупреждение", "Нет данных для экспорта!")
+            return
+
+        try:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[
+                    ("CSV files", "*.csv"),
+                    ("Parquet files", "*.parquet"),
+                    ("Arrow IPC files", "*.arrow"),
+                    ("All files", "*.*")
+                ],
+                initialfile=f"прогноз_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            )
+
+            if file_path:
+                timer = StageTimer("export", path=os.path.basename(file_path))
+                with timer.stage("Экспорт данных"):
+                    rows = write_results(file_path, self.result, self.result_ids)
+                self.finish_timing(timer)
+                messagebox.showinfo("Успешно", f"✅ Сохранено строк: {rows}\n{file_path}")
+
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
+
     def save_chart(self):
         """Сохранение графика в файл"""
-        if self.df is None:
+        if self.result is None:
             messagebox.showwarning("Предупреждение", "Нет графика для сохранения!")
             return
 
@@ -1043,7 +1760,7 @@ y = {a0:.4f} + {a1:.4f}·t + {a2:.4f}·t²
             )
 
             if file_path:
-                self.fig.savefig(file_path, dpi=300, bbox_inches='tight', facecolor=Colors.WHITE)
+                self.chart.savefig(file_path, dpi=300, bbox_inches='tight', facecolor=Colors.WHITE)
                 messagebox.showinfo("Успешно", f"✅ График сохранен в файл:\n{file_path}")
 
         except Exception as e:
@@ -1051,24 +1768,19 @@ y = {a0:.4f} + {a1:.4f}·t + {a2:.4f}·t²
 
     def copy_to_clipboard(self):
         """Копирование данных в буфер обмена"""
-        if self.df is None:
+        if self.result is None:
             messagebox.showwarning("Предупреждение", "Нет данных для копирования!")
             return
 
         try:
             # Формируем текстовое представление таблицы
-            lines = ["Год\tS1\tS2\tS3\tA0\tA1\tA2\tПрогноз\tОшибка\tВерхняя\tНижняя"]
-
-            for _, row in self.df.iterrows():
-                line = f"{row['Год']}\t{row['S1']:.4f}\t{row['S2']:.4f}\t{row['S3']:.4f}\t" \
-                       f"{row['A0']:.4f}\t{row['A1']:.4f}\t{row['A2']:.4f}\t" \
-                       f"{row['Прогноз']:.2f}\t{row['Ошибка']:.2f}\t" \
-                       f"{row['Верхняя']:.2f}\t{row['Нижняя']:.2f}"
-                lines.append(line)
+            formats = [f"%.{d}f" for d in DISPLAY_DECIMALS]
+            columns = self.result.data.reshape(len(FORECAST_COLUMNS), -1)
+            text = "\t".join(FORECAST_COLUMNS) + "\n" + format_block(columns, formats, "\t")
 
             # Копируем в буфер обмена
             self.root.clipboard_clear()
-            self.root.clipboard_append("\n".join(lines))
+            self.root.clipboard_append(text.rstrip("\n"))
 
             messagebox.showinfo("Успешно", "✅ Данные скопированы в буфер обмена!")
 
@@ -1077,9 +1789,30 @@ y = {a0:.4f} + {a1:.4f}·t + {a2:.4f}·t²
 
 
 # -------------------------- ЗАПУСК ПРИЛОЖЕНИЯ --------------------------
+def print_startup_report(app):
+    """Отчет о времени запуска (ключ --startup-report)"""
+    if "График готов" not in app.startup_times:
+        app.root.after(100, print_startup_report, app)
+        return
+
+    print("Время запуска (от импорта main.py):")
+    for stage, moment in app.startup_times.items():
+        print(f"  {stage:<20} {(moment - START_TIME) * 1000:8.1f} мс")
+
+
 def main():
+    if "--timing-log" in sys.argv:
+        # JSON-строки с длительностями этапов каждой операции
+        enable_json_log(sys.argv[sys.argv.index("--timing-log") + 1])
+
     root = tk.Tk()
-    app = ForecastApp(root)
+    if "--history" in sys.argv:
+        # Другой файл базы истории (по умолчанию — в домашнем каталоге)
+        app = ForecastApp(root, sys.argv[sys.argv.index("--history") + 1])
+    else:
+        app = ForecastApp(root)
+    if "--startup-report" in sys.argv:
+        print_startup_report(app)
     root.mainloop()
 
 
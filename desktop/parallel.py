@@ -0,0 +1,91 @@
+"""
+Параллельный расчёт больших панелей в пуле процессов.
+Входные и выходные массивы передаются через multiprocessing.shared_memory,
+рабочие процессы получают только имена буферов и границы своего блока.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from engine import FORECAST_FIELDS, ForecastResult, calculate_forecast_batch
+
+
+def _run_chunk(buffers, n_series, n_obs, horizon, first_year, dtype, lo, hi):
+    """Расчёт строк lo:hi панели внутри рабочего процесса"""
+    # Дочерние процессы делят трекер ресурсов с родителем, освобождает буферы родитель
+    shms = {key: shared_memory.SharedMemory(name=name) for key, name in buffers.items()}
+    try:
+        y = np.ndarray((n_series, n_obs), dtype=dtype, buffer=shms["y"].buf)
+        alpha = np.ndarray((n_series,), buffer=shms["alpha"].buf)
+        data = np.ndarray((len(FORECAST_FIELDS), n_series, horizon), dtype=dtype, buffer=shms["data"].buf)
+        coeffs = np.ndarray((n_series, 3), buffer=shms["coeffs"].buf)
+
+        result = calculate_forecast_batch(y[lo:hi], alpha[lo:hi], horizon, first_year, dtype)
+        data[:, lo:hi], coeffs[lo:hi] = result.data, result.coeffs
+        del y, alpha, data, coeffs
+    finally:
+        for shm in shms.values():
+            shm.close()
+
+
+def calculate_forecast_parallel(panel, alpha, horizon=13, first_year=2004,
+                                workers=None, chunk_size=20000, dtype=np.float64):
+    """
+    То же, что calculate_forecast_batch, но блоками по chunk_size рядов
+    в пуле из workers процессов. Разбиение зависит только от chunk_size,
+    поэтому результат не зависит от числа процессов.
+    """
+    dtype = np.dtype(dtype)
+    y = np.ascontiguousarray(panel, dtype=dtype)
+    if y.ndim == 1:
+        y = y[None, :]
+    n_series, n_obs = y.shape
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,)).copy()
+
+    bounds = [(lo, min(lo + chunk_size, n_series)) for lo in range(0, n_series, chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(bounds))
+    if workers <= 1:
+        # Один процесс: те же блоки, но без пула и общих буферов
+        data = np.empty((len(FORECAST_FIELDS), n_series, horizon), dtype=dtype)
+        coeffs = np.empty((n_series, 3))
+        for lo, hi in bounds:
+            result = calculate_forecast_batch(y[lo:hi], alpha[lo:hi], horizon, first_year, dtype)
+            data[:, lo:hi], coeffs[lo:hi] = result.data, result.coeffs
+        return ForecastResult(data, coeffs, y, alpha)
+
+    # Панель и поля прогноза — в точности расчета, α и коэффициенты — float64
+    shapes = {
+        "y": ((n_series, n_obs), dtype),
+        "alpha": ((n_series,), np.dtype(np.float64)),
+        "data": ((len(FORECAST_FIELDS), n_series, horizon), dtype),
+        "coeffs": ((n_series, 3), np.dtype(np.float64)),
+    }
+    shms, views = {}, {}
+    try:
+        for key, (shape, item) in shapes.items():
+            shms[key] = shared_memory.SharedMemory(create=True, size=max(item.itemsize * int(np.prod(shape)), 1))
+        views.update({key: np.ndarray(shape, dtype=item, buffer=shms[key].buf)
+                      for key, (shape, item) in shapes.items()})
+        views["y"][:] = y
+        views["alpha"][:] = alpha
+
+        buffers = {key: shm.name for key, shm in shms.items()}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_chunk, buffers, n_series, n_obs, horizon, first_year, dtype, lo, hi)
+                for lo, hi in bounds
+            ]
+            for future in futures:
+                future.result()
+
+        data, coeffs = views["data"].copy(), views["coeffs"].copy()
+    finally:
+        # Представления нужно отпустить до закрытия буферов
+        views.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+
+    return ForecastResult(data, coeffs, y, alpha)
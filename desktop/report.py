@@ -0,0 +1,192 @@
+"""
+Пакетные отчеты: графики «все данные / прогноз / тренд» для каждого ряда панели.
+Отрисовка идет вне экрана (Agg) в пуле процессов; каждый процесс один раз
+создает шаблон фигуры (ForecastChart) и переиспользует его для всех своих рядов.
+Результат — PNG-файлы в каталоге или один многостраничный PDF.
+"""
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import calculate_forecast_batch
+
+VIEWS = ("all", "forecast", "trend")
+
+# Шаблон графика рабочего процесса (см. _init_worker)
+_chart = None
+
+
+def _init_worker(figsize, dpi):
+    """Создание фигуры-шаблона в рабочем процессе"""
+    global _chart
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from chart import ForecastChart
+    from theme import Colors, apply_plot_style
+
+    apply_plot_style()
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    fig.patch.set_facecolor(Colors.WHITE)
+    ax.set_facecolor(Colors.WHITE)
+    _chart = ForecastChart(fig, ax, FigureCanvasAgg(fig), Colors)
+
+
+def _render_block(y, alpha, names, horizon, first_year, views, out_dir):
+    """
+    Расчет и отрисовка блока рядов. С out_dir кадры сохраняются в PNG
+    и возвращается их число, иначе — список сжатых страниц для PdfReport.
+    """
+    from matplotlib.image import imsave
+
+    result = calculate_forecast_batch(y, alpha, horizon, first_year)
+    frames = []
+    for i, name in enumerate(names):
+        _chart.set_label(f"Ряд {name}")
+        for k, view in enumerate(views):
+            if k == 0:
+                _chart.show(result.series(i), view=view)
+            else:
+                _chart.set_view(view)
+
+            # Кадр уже собран в буфере холста (фон + динамический слой)
+            frame = np.asarray(_chart.canvas.buffer_rgba())[..., :3]
+            if out_dir is None:
+                frames.append(compress_frame(frame))
+            else:
+                filename = re.sub(r'[\\/:*?"<>|]', "_", f"{name}_{view}.png")
+                imsave(os.path.join(out_dir, filename), frame)
+    return len(names) * len(views) if out_dir is not None else frames
+
+
+def render_report(panel, alpha, out, ids=None, views=VIEWS, horizon=13, first_year=2004,
+                  workers=None, chunk_size=25, figsize=(10, 6), dpi=100):
+    """
+    Графики для всех рядов панели. out — каталог для PNG ({ряд}_{вид}.png)
+    или файл .pdf (страница на каждый вид каждого ряда, в порядке рядов).
+    Возвращает число сохраненных изображений.
+    """
+    y = np.ascontiguousarray(panel, dtype=float)
+    if y.ndim == 1:
+        y = y[None, :]
+    n_series = len(y)
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_series,))
+    names = [str(name) for name in (range(n_series) if ids is None else ids)]
+
+    for view in views:
+        if view not in VIEWS:
+            raise ValueError(f"Неизвестный вид графика: {view}")
+
+    pdf = out.lower().endswith(".pdf")
+    out_dir = None if pdf else out
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    blocks = [
+        (y[lo:lo + chunk_size], alpha[lo:lo + chunk_size], names[lo:lo + chunk_size],
+         horizon, first_year, tuple(views), out_dir)
+        for lo in range(0, n_series, chunk_size)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(blocks))
+
+    report = PdfReport(out, dpi) if pdf else None
+    saved = 0
+    try:
+        for result in _run_blocks(blocks, workers, figsize, dpi):
+            if report is None:
+                saved += result
+                continue
+            for page in result:
+                report.add(page)
+                saved += 1
+    finally:
+        if report is not None:
+            report.close()
+    return saved
+
+
+def _run_blocks(blocks, workers, figsize, dpi):
+    """
+    Результаты блоков по порядку. В пуле одновременно выполняется
+    не больше 2 * workers блоков, чтобы страницы PDF не копились в памяти.
+    """
+    if workers <= 1:
+        _init_worker(figsize, dpi)
+        for block in blocks:
+            yield _render_block(*block)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(figsize, dpi)) as pool:
+        pending = []
+        for block in blocks:
+            pending.append(pool.submit(_render_block, *block))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class PdfReport:
+    """
+    Многостраничный PDF из готовых кадров: страница — одно изображение RGB
+    со сжатием Flate. Кадры сжимаются в рабочих процессах (compress_frame),
+    здесь только дописываются объекты страниц, поэтому запись не зависит
+    от matplotlib и не держит в памяти больше одной страницы.
+    """
+
+    def __init__(self, path, dpi):
+        self.dpi = dpi
+        self.stream = open(path, "wb")
+        self.offsets = {}   # номер объекта -> смещение в файле
+        self.pages = []
+        self.stream.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def write_object(self, number, body, data=None):
+        self.offsets[number] = self.stream.tell()
+        self.stream.write(b"%d 0 obj\n" % number + body)
+        if data is not None:
+            self.stream.write(b"\nstream\n" + data + b"\nendstream")
+        self.stream.write(b"\nendobj\n")
+
+    def add(self, page):
+        """Страница из кадра, сжатого compress_frame: (ширина, высота, данные)"""
+        width, height, data = page
+        image, content, number = (3 + 3 * len(self.pages) + k for k in range(3))
+        w, h = width * 72 / self.dpi, height * 72 / self.dpi
+
+        self.write_object(image, b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+                                 b"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+                                 b"/Length %d >>" % (width, height, len(data)), data)
+        draw = b"q %.4f 0 0 %.4f 0 0 cm /Im0 Do Q" % (w, h)
+        self.write_object(content, b"<< /Length %d >>" % len(draw), draw)
+        self.write_object(number, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.4f %.4f] "
+                                  b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+                                  % (w, h, image, content))
+        self.pages.append(number)
+
+    def close(self):
+        """Каталог, дерево страниц и таблица ссылок"""
+        try:
+            self.write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+            kids = b" ".join(b"%d 0 R" % number for number in self.pages)
+            self.write_object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages)))
+
+            xref = self.stream.tell()
+            size = max(self.offsets) + 1
+            self.stream.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+            for number in range(1, size):
+                self.stream.write(b"%010d 00000 n \n" % self.offsets[number])
+            self.stream.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+        finally:
+            self.stream.close()
+
+
+def compress_frame(frame):
+    """Кадр RGB (uint8) для PdfReport: (ширина, высота, данные Flate)"""
+    height, width, _ = frame.shape
+    return width, height, zlib.compress(np.ascontiguousarray(frame).tobytes(), 6)
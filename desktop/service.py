@@ -0,0 +1,380 @@
+"""
+Локальный HTTP/JSON-сервис прогноза на asyncio (только стандартная библиотека и numpy):
+
+    python desktop serve --port 8765
+
+    POST /forecast  {"values": [75.4, 77.9, ...], "alpha": 0.0625, "horizon": 13, "first_year": 2004}
+                    values — один ряд или список рядов одной длины; alpha — число или "auto"
+    GET  /stats     число запросов, размеры пакетов, задержка p50/p99
+    GET  /health
+
+Запросы, пришедшие в пределах окна window (несколько мс), объединяются
+в один вызов calculate_forecast_batch по группам с одинаковыми (n_obs, horizon,
+first_year). Расчет идет в отдельном потоке, цикл событий только принимает
+и отправляет данные. Если ожидающих запросов больше max_pending, новые
+получают 429 с Retry-After. Модули интерфейса (tkinter, matplotlib) не импортируются.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from engine import FORECAST_FIELDS, calculate_forecast_batch, optimize_alpha
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Окно объединения запросов (с), строк в одном пакете, ожидающих запросов до отказа
+WINDOW = 0.002
+MAX_BATCH = 4096
+MAX_PENDING = 1000
+
+MAX_BODY = 16 * 2 ** 20
+MAX_HORIZON = 1000
+
+# Задержки последних запросов для перцентилей
+LATENCY_WINDOW = 10000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ForecastRequest:
+    """Проверенный запрос прогноза: ряды (k, n_obs), α (NaN — подбор), горизонт"""
+
+    __slots__ = ("y", "alpha", "horizon", "first_year", "single")
+
+    def __init__(self, body):
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HttpError(400, f"Некорректный JSON: {e}") from None
+        if not isinstance(payload, dict) or "values" not in payload:
+            raise HttpError(400, "Ожидается объект с полем values")
+
+        try:
+            y = np.array(payload["values"], dtype=np.float64)
+            alpha = payload.get("alpha", 0.0625)
+            alpha = np.nan if alpha == "auto" else float(alpha)
+            self.horizon = int(payload.get("horizon", 13))
+            self.first_year = int(payload.get("first_year", 2004))
+        except (TypeError, ValueError) as e:
+            raise HttpError(400, f"Некорректные параметры: {e}") from None
+
+        self.single = y.ndim == 1
+        self.y = np.atleast_2d(y)
+        self.alpha = alpha
+        if self.y.ndim != 2 or self.y.size == 0:
+            raise HttpError(400, "values — ряд или список рядов одной длины")
+        if self.y.shape[1] < 3:
+            raise HttpError(400, f"Нужно не меньше 3 значений в ряду, передано {self.y.shape[1]}")
+        if not np.isfinite(self.y).all():
+            raise HttpError(400, "values содержит нечисловые значения")
+        if not (np.isnan(alpha) or 0 < alpha < 1):
+            raise HttpError(400, "alpha должен быть в диапазоне 0 < α < 1 или 'auto'")
+        if not 1 <= self.horizon <= MAX_HORIZON:
+            raise HttpError(400, f"horizon должен быть от 1 до {MAX_HORIZON}")
+
+    @property
+    def key(self):
+        """Запросы с одинаковым ключом считаются одним вызовом движка"""
+        return self.y.shape[1], self.horizon, self.first_year
+
+
+def series_payload(data, coeffs, alpha):
+    """Ответ для одного ряда: α, коэффициенты тренда и поля прогноза"""
+    payload = {"alpha": alpha, "coeffs": coeffs}
+    payload.update(zip(FORECAST_FIELDS, data))
+    return payload
+
+
+def compute_batch(requests):
+    """
+    Расчет пакета (в потоке-исполнителе): группы по ключу, по вызову движка
+    на группу. Возвращает тела ответов в порядке запросов (HttpError вместо
+    тела — ответ с ошибкой только этому запросу).
+    """
+    bodies = [None] * len(requests)
+    groups = {}
+    for index, request in enumerate(requests):
+        groups.setdefault(request.key, []).append(index)
+
+    for (n_obs, horizon, first_year), indices in groups.items():
+        y = np.concatenate([requests[i].y for i in indices])
+        alpha = np.concatenate([np.full(len(requests[i].y), requests[i].alpha) for i in indices])
+        auto = np.isnan(alpha)
+        if auto.any():
+            # Подбор α по каждому ряду отдельно: не зависит от состава пакета
+            alpha[auto] = optimize_alpha(y[auto])
+
+        result = calculate_forecast_batch(y, alpha, horizon, first_year)
+        data = result.data.transpose(1, 0, 2).tolist()
+        coeffs = result.coeffs.tolist()
+        alpha = result.alpha.tolist()
+
+        start = 0
+        for i in indices:
+            stop = start + len(requests[i].y)
+            series = [series_payload(data[k], coeffs[k], alpha[k]) for k in range(start, stop)]
+            payload = series[0] if requests[i].single else {"series": series}
+            try:
+                bodies[i] = json.dumps(payload, allow_nan=False).encode()
+            except ValueError:
+                # Переполнение при расчете: NaN/Infinity не являются JSON
+                bodies[i] = HttpError(400, "Результат расчета не конечен: значения ряда слишком велики")
+            start = stop
+    return bodies
+
+
+class MicroBatcher:
+    """
+    Накопление запросов в течение window секунд (или до max_batch строк)
+    и расчет их одним пакетом в отдельном потоке. Пакеты считаются по одному:
+    пока идет расчет, следующие запросы копятся в новый пакет.
+    """
+
+    def __init__(self, window=WINDOW, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+
+        self.queue = []         # (запрос, future) текущего пакета
+        self.rows = 0
+        self.timer = None
+        self.pending = 0        # принятые и еще не отвеченные запросы
+        self.batches = 0
+        self.batched_requests = 0
+
+    async def submit(self, request):
+        """Тело ответа для запроса; при переполнении — HttpError 429"""
+        if self.pending >= self.max_pending:
+            raise HttpError(429, f"Сервис перегружен: {self.pending} запросов в очереди")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.append((request, future))
+        self.rows += len(request.y)
+        self.pending += 1
+        try:
+            if self.rows >= self.max_batch:
+                self.flush()
+            elif self.timer is None:
+                self.timer = loop.call_later(self.window, self.flush)
+            return await future
+        finally:
+            self.pending -= 1
+
+    def flush(self):
+        """Отправка накопленного пакета на расчет"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        jobs, self.queue, self.rows = self.queue, [], 0
+        if not jobs:
+            return
+
+        self.batches += 1
+        self.batched_requests += len(jobs)
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, compute_batch, [request for request, _ in jobs])
+        task.add_done_callback(lambda done: self.deliver(jobs, done))
+
+    @staticmethod
+    def deliver(jobs, done):
+        """Результаты пакета в future запросов (отключившиеся клиенты пропускаются)"""
+        error = done.exception() if not done.cancelled() else HttpError(500, "Расчет отменен")
+        bodies = done.result() if error is None else None
+        for k, (_, future) in enumerate(jobs):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            elif isinstance(bodies[k], HttpError):
+                future.set_exception(bodies[k])
+            else:
+                future.set_result(bodies[k])
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ForecastService:
+    """
+    HTTP/1.1 с keep-alive поверх asyncio.start_server. port=0 — свободный порт
+    (после start() он в self.port), что удобно для проверки локальным клиентом.
+    """
+
+    def __init__(self, host=HOST, port=PORT, window=WINDOW, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(window, max_batch, max_pending)
+        self.server = None
+        self.connections = {}   # writer -> задача обработки соединения
+
+        self.started = time.time()
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.batcher.close()
+
+    async def close(self):
+        """Остановка: новые соединения не принимаются, открытые закрываются"""
+        self.server.close()
+        for writer in self.connections:
+            writer.close()
+        await asyncio.gather(*self.connections.values(), return_exceptions=True)
+        await self.server.wait_closed()
+        self.batcher.close()
+
+    async def handle(self, reader, writer):
+        """Соединение клиента: запросы по очереди, пока клиент не закроет его"""
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    # Тело не дочитано: после ответа соединение закрывается
+                    writer.write(response(e.status, {"error": str(e)}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                status, payload = await self.dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.connections[writer]
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """Статус и тело ответа (bytes с готовым JSON или объект для сериализации)"""
+        path = path.split("?", 1)[0]
+        if path == "/forecast":
+            if method != "POST":
+                return 405, {"error": "Используйте POST"}
+            start = time.perf_counter()
+            self.requests += 1
+            try:
+                result = await self.batcher.submit(ForecastRequest(body))
+            except HttpError as e:
+                if e.status == 429:
+                    self.rejected += 1
+                return e.status, {"error": str(e)}
+            except Exception as e:
+                self.errors += 1
+                return 500, {"error": f"Ошибка расчета: {e}"}
+            self.latencies.append(time.perf_counter() - start)
+            return 200, result
+
+        if method != "GET":
+            return 405, {"error": "Используйте GET"}
+        if path == "/stats":
+            return 200, self.stats()
+        if path == "/health":
+            return 200, {"status": "ok"}
+        return 404, {"error": f"Нет ресурса {path}"}
+
+    def stats(self):
+        """Счетчики и задержки (мс) последних LATENCY_WINDOW успешных запросов"""
+        batcher = self.batcher
+        p50, p99 = np.percentile(self.latencies, [50, 99]) * 1000 if self.latencies else (0.0, 0.0)
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "pending": batcher.pending,
+            "batches": batcher.batches,
+            "mean_batch": round(batcher.batched_requests / batcher.batches, 2) if batcher.batches else 0.0,
+            "latency_ms": {"p50": round(float(p50), 3), "p99": round(float(p99), 3)},
+        }
+
+
+async def read_request(reader):
+    """(метод, путь, заголовки, тело) или None, если клиент закрыл соединение"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HttpError(400, "Неполный запрос") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(413, "Слишком длинные заголовки") from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Некорректная строка запроса") from None
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Некорректный Content-Length") from None
+    if length > MAX_BODY:
+        raise HttpError(413, f"Тело запроса больше {MAX_BODY} байт")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def response(status, payload, keep_alive=True):
+    """HTTP-ответ с JSON-телом"""
+    body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode()
+    head = [
+        f"HTTP/1.1 {status} {REASONS[status]}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 429:
+        head.append("Retry-After: 1")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+def serve(host=HOST, port=PORT, **kwargs):
+    """Запуск сервиса до прерывания (Ctrl+C)"""
+    async def run():
+        service = await ForecastService(host, port, **kwargs).start()
+        print(f"Сервис прогноза: http://{service.host}:{service.port} (Ctrl+C — остановка)", flush=True)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
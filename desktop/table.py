@@ -0,0 +1,238 @@
+"""
+Виртуальная таблица результатов: в Treeview находятся только видимые строки,
+значения берутся из массивов ForecastResult и форматируются при прокрутке
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from engine import FORECAST_COLUMNS
+from export import DISPLAY_DECIMALS
+
+SERIES_COLUMN = "Ряд"
+
+
+def format_rows(data):
+    """
+    Строки таблицы для отображения из полей ForecastResult.data.
+    Округление выполняется только здесь, движок хранит полную точность.
+    """
+    formats = [f"{{:.{d}f}}" for d in DISPLAY_DECIMALS]
+    return [[fmt.format(v) for fmt, v in zip(formats, row)] for row in data.T.tolist()]
+
+
+class VirtualTable(tk.Frame):
+    """
+    Таблица с виртуальной прокруткой. Строки результата нумеруются
+    по порядку (ряд, шаг); сортировка хранит только перестановку индексов.
+    Ряды панели показываются и ищутся по идентификаторам из импорта.
+    """
+
+    def __init__(self, master=None, style="Treeview", **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.style = style
+        self.data = None        # (11, n_rows) — представление без копирования
+        self.horizon = 1
+        self.ids = None         # идентификаторы рядов панели (без них — номера по порядку)
+        self.series_index = {}  # идентификатор ряда -> номер ряда
+        self.order = None       # перестановка строк при сортировке (None — исходный порядок)
+        self.sort_column = None
+        self.sort_descending = False
+        self.first = 0          # индекс первой видимой строки
+        self.visible = 15       # число строк, помещающихся в окне (уточняется в on_resize)
+
+        self.tree = ttk.Treeview(self, show="headings", style=style, height=15)
+        self.scrollbar_y = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar_x = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.scrollbar_x.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar_y.grid(row=0, column=1, sticky="ns")
+        self.scrollbar_x.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        for key, rows in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda e, n=rows: self.scroll(n))
+        for key, pages in (("<Prior>", -1), ("<Next>", 1)):
+            self.tree.bind(key, lambda e, n=pages: self.scroll(n * self.visible))
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<End>", lambda e: self.scroll_to(self.n_rows))
+
+        self.set_columns(FORECAST_COLUMNS)
+        self.update_scrollbar()
+
+    @property
+    def n_rows(self):
+        return 0 if self.data is None else self.data.shape[1]
+
+    @property
+    def panel(self):
+        """Несколько рядов: в таблице появляется столбец с идентификатором ряда"""
+        return self.n_rows > self.horizon
+
+    def set_columns(self, columns):
+        """Настройка столбцов Treeview"""
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = columns
+        for col in columns:
+            width = 60 if col in (SERIES_COLUMN, "Год") else 80
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=width, anchor="center", minwidth=50)
+
+    def set_result(self, result, ids=None):
+        """
+        Показ результата расчета (ForecastResult) или очистка при None;
+        ids — идентификаторы рядов панели в порядке result
+        """
+        if result is None:
+            self.data = None
+            self.horizon = 1
+        else:
+            self.data = result.data.reshape(len(FORECAST_COLUMNS), -1)
+            self.horizon = result.horizon
+
+        n_series = self.n_rows // self.horizon
+        self.ids = np.arange(n_series) if ids is None else np.asarray(ids)
+        self.series_index = {str(name): i for i, name in enumerate(self.ids.tolist())}
+
+        self.order = None
+        self.sort_column = None
+        self.sort_descending = False
+        self.first = 0
+
+        self.set_columns(([SERIES_COLUMN] if self.panel else []) + FORECAST_COLUMNS)
+        self.render()
+
+    # -------------------------- ПРОКРУТКА --------------------------
+    def on_resize(self, event):
+        """Пересчет числа видимых строк при изменении размера"""
+        rowheight = int(ttk.Style().lookup(self.style, "rowheight") or 25)
+        visible = max(1, event.height // rowheight - 1)  # одна строка — заголовок
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def on_mousewheel(self, event):
+        self.scroll(-3 * int(event.delta / 120) or (-1 if event.delta > 0 else 1))
+        return "break"  # не передавать событие прокрутке левой панели
+
+    def scroll(self, rows):
+        self.scroll_to(self.first + rows)
+        return "break"
+
+    def scroll_to(self, first):
+        """Прокрутка к строке first (позиция в текущем порядке сортировки)"""
+        first = max(0, min(int(first), self.n_rows - self.visible))
+        if first != self.first:
+            self.first = first
+            self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Команда вертикальной полосы прокрутки"""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * self.n_rows))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def update_scrollbar(self):
+        if self.n_rows <= self.visible:
+            self.scrollbar_y.set(0.0, 1.0)
+        else:
+            self.scrollbar_y.set(self.first / self.n_rows, (self.first + self.visible) / self.n_rows)
+
+    # -------------------------- ОТРИСОВКА --------------------------
+    def visible_rows(self):
+        """Индексы строк результата в окне просмотра"""
+        last = min(self.first + self.visible, self.n_rows)
+        if self.order is None:
+            return np.arange(self.first, last)
+        return self.order[self.first:last]
+
+    def render(self):
+        """Форматирование и вывод только видимых строк"""
+        if self.data is None:
+            self.tree.delete(*self.tree.get_children())
+            self.update_scrollbar()
+            return
+
+        rows_idx = self.visible_rows()
+        rows = format_rows(self.data[:, rows_idx])
+        if self.panel:
+            names = self.ids[rows_idx // self.horizon].tolist()
+            rows = [[str(name)] + row for name, row in zip(names, rows)]
+
+        # Элементы Treeview переиспользуются, меняются только значения
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+        for i, values in enumerate(rows):
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert("", tk.END, values=values)
+
+        self.update_scrollbar()
+
+    # -------------------------- СОРТИРОВКА И ПЕРЕХОД --------------------------
+    def sort_by(self, column):
+        """Сортировка по столбцу: по возрастанию, по убыванию, исходный порядок"""
+        if self.data is None:
+            return
+
+        if column != self.sort_column:
+            self.sort_column, self.sort_descending = column, False
+        elif not self.sort_descending:
+            self.sort_descending = True
+        else:
+            self.sort_column, self.sort_descending = None, False
+
+        if self.sort_column is None:
+            self.order = None
+        elif column == SERIES_COLUMN:
+            # Шаги ряда идут подряд: переставляются только ряды (по идентификатору)
+            series = np.argsort(self.ids, kind="stable")
+            if self.sort_descending:
+                series = series[::-1]
+            self.order = (series[:, None] * self.horizon + np.arange(self.horizon)).ravel()
+        else:
+            keys = self.data[FORECAST_COLUMNS.index(column)]
+            self.order = np.argsort(-keys if self.sort_descending else keys, kind="stable")
+
+        for col in self.tree["columns"]:
+            mark = ""
+            if col == self.sort_column:
+                mark = " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(col, text=col + mark)
+
+        self.first = 0
+        self.render()
+
+    def find_series(self, name):
+        """Номер ряда по идентификатору"""
+        try:
+            return self.series_index[str(name).strip()]
+        except KeyError:
+            raise ValueError(f"Нет ряда «{name}» в результате") from None
+
+    def show_series(self, series):
+        """Прокрутка к первому шагу прогноза ряда с номером series"""
+        n_series = self.n_rows // self.horizon
+        if not 0 <= series < n_series:
+            raise ValueError(f"Номер ряда должен быть от 0 до {n_series - 1}")
+
+        row = series * self.horizon
+        if self.order is None:
+            position = row
+        else:
+            position = int(np.flatnonzero(self.order == row)[0])
+        self.scroll_to(position)
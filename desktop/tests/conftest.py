@@ -0,0 +1,9 @@
+"""
+Модули приложения лежат в desktop/ без пакета, как при запуске python desktop ...
+
+    python -m pytest desktop/tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from engine import ForecastModel, _trend_stats
+
+
+def batch_stats(values):
+    coeffs, kvadr = _trend_stats(np.asarray(values, dtype=float)[None])
+    return coeffs[0], kvadr[0, 0]
+
+
+@pytest.mark.parametrize("values", [
+    [1.0, 2.0, 3.0],
+    3 * np.arange(1, 2001.0) ** 2 - 5 * np.arange(1, 2001.0) + 7,
+])
+def test_forecast_model_exact_quadratic(values):
+    """Точный квадратичный тренд: остатков нет"""
+    model = ForecastModel(values)
+    assert model.kvadr == pytest.approx(0, abs=1e-12 * np.abs(values).max())
+
+
+def test_forecast_model_large_offset_matches_batch():
+    """Уровень 1e6 при n = 1e5: СКО совпадает с пакетным расчетом"""
+    values = 1e6 + np.random.default_rng(0).normal(size=100000)
+    coeffs, kvadr = batch_stats(values)
+
+    model = ForecastModel(values)
+    assert model.kvadr == pytest.approx(kvadr, rel=1e-9)
+    np.testing.assert_allclose(model.coeffs, coeffs, rtol=1e-9, atol=1e-9)
+
+
+def test_forecast_model_incremental_matches_batch():
+    """update и extend блоками разной длины дают то же, что расчет по всему ряду"""
+    values = 1e6 + np.random.default_rng(1).normal(size=500).cumsum()
+    model = ForecastModel(values[:2])
+    for value in values[2:50]:
+        model.update(value)
+    for lo, hi in ((50, 52), (52, 300), (300, 500)):
+        model.extend(values[lo:hi])
+
+    coeffs, kvadr = batch_stats(values)
+    assert model.kvadr == pytest.approx(kvadr, rel=1e-9)
+    np.testing.assert_allclose(model.coeffs, coeffs, rtol=1e-9)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from engine import calculate_forecast_batch
+from export import RESULT_COLUMNS, format_block, open_writer, quote_ids, result_chunks
+from importer import CsvReader, read_panel
+
+
+@pytest.mark.parametrize("header", [True, False])
+def test_csv_export_round_trip_with_quoted_ids(tmp_path, header):
+    """CSV экспорта читается обратно: идентификаторы с разделителем и кавычками"""
+    ids = np.array(["Moscow, city", 'Ряд "А"', "Kazan"])
+    panel = np.arange(30.0).reshape(3, 10) + np.random.default_rng(0).normal(size=(3, 10))
+    result = calculate_forecast_batch(panel, 0.3, horizon=5)
+
+    path = tmp_path / "result.csv"
+    with open_writer(str(path)) as writer:
+        for columns in result_chunks(result, ids):
+            writer.write(columns)
+    if not header:
+        # Без заголовка (по умолчанию в CLI) первая строка — уже ряд в кавычках
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        path.write_text("".join(lines[1:]), encoding="utf-8")
+
+    period, value = RESULT_COLUMNS.index("Год"), RESULT_COLUMNS.index("Прогноз")
+    read_ids, forecast = read_panel(str(path), layout="long", header=header, id_column=0,
+                                    period_column=period, value_column=value)
+    assert read_ids.tolist() == ids.tolist()
+    np.testing.assert_allclose(forecast, result.data[value - 2], rtol=1e-9)
+
+
+def test_csv_wide_panel_with_quoted_ids(tmp_path):
+    """Широкая панель без заголовка: число столбцов — по первой строке с кавычками"""
+    ids = np.array(["Moscow, city", "Kazan"])
+    panel = np.arange(20.0).reshape(2, 10)
+    path = tmp_path / "panel.csv"
+    path.write_text(format_block([quote_ids(ids)] + list(panel.T), ["%s"] + ["%.10g"] * 10),
+                    encoding="utf-8")
+
+    read_ids, values = read_panel(str(path), id_column=0)
+    assert read_ids.tolist() == ids.tolist()
+    np.testing.assert_array_equal(values, panel)
+
+
+def test_csv_header_with_quoted_delimiter(tmp_path):
+    path = tmp_path / "panel.csv"
+    path.write_text('"Ряд, город",2004,2005\n"Moscow, city",1,2\n', encoding="utf-8")
+    with CsvReader(str(path), header=True) as reader:
+        assert reader.n_columns == 3
+        assert reader.names == ["Ряд, город", "2004", "2005"]
@@ -0,0 +1,29 @@
+"""
+Цветовая схема и стиль графиков: общие для окна приложения и пакетных отчетов
+(модуль не импортирует tkinter)
+"""
+
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+
+
+class Colors:
+    """Цветовая схема приложения"""
+    PRIMARY = "#2C3E50"  # Темно-синий
+    SECONDARY = "#34495E"  # Светло-синий
+    ACCENT = "#3498DB"  # Голубой
+    SUCCESS = "#2ECC71"  # Зеленый
+    WARNING = "#F39C12"  # Оранжевый
+    DANGER = "#E74C3C"  # Красный
+    LIGHT = "#ECF0F1"  # Светло-серый
+    DARK = "#2C3E50"  # Темный
+    WHITE = "#FFFFFF"  # Белый
+    GRAY = "#95A5A6"  # Серый
+
+    CHART_COLORS = ["#3498DB", "#2ECC71", "#E74C3C", "#9B59B6", "#F1C40F"]
+
+
+def apply_plot_style():
+    """Настройка стиля matplotlib (вызывается после загрузки matplotlib)"""
+    import matplotlib.style
+
+    matplotlib.style.use(PLOT_STYLE)
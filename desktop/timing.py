@@ -0,0 +1,96 @@
+"""
+Замер времени этапов расчета, отображения и экспорта.
+
+    timer = StageTimer("forecast", n_series=1)
+    with timer.stage("Расчет прогноза"):
+        ...
+    timer.log()
+
+Результаты выводятся текстом в панель статистики, пишутся JSON-записями
+в журнал (логгер forecast.timing, см. enable_json_log) и при profile=True
+собираются в профиль cProfile.
+"""
+import cProfile
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger("forecast.timing")
+
+
+class StageTimer:
+    """
+    Длительности именованных этапов одной операции в порядке первого входа.
+    Повторный вход в этап суммируется (например, блоки потокового расчета).
+    Этапы могут выполняться в разных потоках, но не одновременно.
+    """
+
+    def __init__(self, operation, profile=False, **context):
+        self.operation = operation
+        self.context = context
+        self.stages = {}
+        self.profiles = [] if profile else None
+        self.profile_path = None
+        self.started = datetime.now()
+
+    @contextmanager
+    def stage(self, name):
+        """Замер этапа; при профилировании этап выполняется под cProfile"""
+        profiler = None
+        if self.profiles is not None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self.profiles.append(profiler)
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+    def record(self):
+        """Запись для журнала: операция, контекст и длительности этапов в мс"""
+        return {
+            "event": self.operation,
+            "time": self.started.isoformat(timespec="seconds"),
+            **self.context,
+            "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            "total_ms": round(self.total * 1000, 3),
+        }
+
+    def log(self):
+        logger.info(json.dumps(self.record(), ensure_ascii=False))
+
+    def text(self):
+        """Строки «этап — мс» для панели статистики"""
+        lines = [f"{name:<28} {seconds * 1000:10.1f} мс" for name, seconds in self.stages.items()]
+        lines.append(f"{'Итого':<28} {self.total * 1000:10.1f} мс")
+        return "\n".join(lines)
+
+    def dump_profile(self, path):
+        """Объединенный профиль всех этапов в файл pstats (None, если профиль не собирался)"""
+        if not self.profiles:
+            return None
+        pstats.Stats(*self.profiles).dump_stats(path)
+        self.profile_path = path
+        return path
+
+
+def enable_json_log(path):
+    """Запись JSON-строк логгера forecast.timing в файл (по строке на операцию)"""
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler